@@ -4,8 +4,30 @@
 部品ライブラリと連携し、AIによる部品選択に対応。
 """
 
+import re
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 
+# 意図フィールドのキーワード照合用（インポート時に1回だけコンパイル）
+_MECH_PATTERNS = {
+    "gear": re.compile(r"gear|歯車", re.I),
+    "shaft": re.compile(r"shaft|軸", re.I),
+}
+_CONN_PATTERNS = {
+    "bolt": re.compile(r"bolt|ボルト", re.I),
+}
+
+
+@dataclass(slots=True)
+class PartSelection:
+    """ライブラリから選択された部品（AI/ヒューリスティック共通）。"""
+
+    part_id: str
+    parameters: Dict[str, Any]
+    confidence: float
+    reasoning: str
+    quantity: int = 1
+
 
 def _outline_stats(points):
     if not points:
@@ -87,7 +109,7 @@ def infer_parts_from_intent(
     intent: Dict[str, Any],
     vision: Optional[Dict] = None,
     api_key: Optional[str] = None
-) -> List[Dict[str, Any]]:
+) -> List[PartSelection]:
     """
     ユーザー意図から複数部品を推定する。
 
@@ -99,7 +121,7 @@ def infer_parts_from_intent(
         api_key: AI選択用の OpenAI API キー
 
     戻り値:
-        部品IDとパラメータを含む選択結果のリスト
+        部品IDとパラメータを含む PartSelection のリスト
     """
     if api_key:
         # ライブラリのAI選択を使用
@@ -107,13 +129,13 @@ def infer_parts_from_intent(
             from .library import select_parts_for_intent
             result = select_parts_for_intent(intent, api_key, vision)
             return [
-                {
-                    "part_id": sp.part_id,
-                    "parameters": sp.parameters,
-                    "confidence": sp.confidence,
-                    "reasoning": sp.reasoning,
-                    "quantity": sp.quantity
-                }
+                PartSelection(
+                    part_id=sp.part_id,
+                    parameters=sp.parameters,
+                    confidence=sp.confidence,
+                    reasoning=sp.reasoning,
+                    quantity=sp.quantity
+                )
                 for sp in result.parts
             ]
         except Exception:
@@ -127,7 +149,7 @@ def infer_parts_from_intent(
 def _heuristic_part_selection(
     intent: Dict[str, Any],
     vision: Optional[Dict]
-) -> List[Dict[str, Any]]:
+) -> List[PartSelection]:
     """AIなしのフォールバック用ヒューリスティック部品選択。"""
     parts = []
 
@@ -136,55 +158,55 @@ def _heuristic_part_selection(
         vision_result = infer_part_from_vision(vision)
         part_id = _map_hint_to_library_id(vision_result.get("label", ""))
         if part_id:
-            parts.append({
-                "part_id": part_id,
-                "parameters": {},
-                "confidence": vision_result["confidence"],
-                "reasoning": "Inferred from vision analysis",
-                "quantity": 1
-            })
+            parts.append(PartSelection(
+                part_id=part_id,
+                parameters={},
+                confidence=vision_result["confidence"],
+                reasoning="Inferred from vision analysis",
+                quantity=1
+            ))
 
     # 機構タイプを確認
-    mechanism = (intent.get("mechanism_type") or "").lower()
+    mechanism = intent.get("mechanism_type") or ""
 
-    if "gear" in mechanism or "歯車" in mechanism:
+    if _MECH_PATTERNS["gear"].search(mechanism):
         gear_params = _infer_gear_params(intent)
-        if not any(p["part_id"] == "spur_gear" for p in parts):
-            parts.append({
-                "part_id": "spur_gear",
-                "parameters": gear_params,
-                "confidence": 0.6,
-                "reasoning": "Mechanism type indicates gear",
-                "quantity": 2
-            })
-
-    if "shaft" in mechanism or "軸" in mechanism:
-        if not any(p["part_id"] == "shaft" for p in parts):
-            parts.append({
-                "part_id": "shaft",
-                "parameters": {},
-                "confidence": 0.5,
-                "reasoning": "Mechanism requires shaft",
-                "quantity": 1
-            })
+        if not any(p.part_id == "spur_gear" for p in parts):
+            parts.append(PartSelection(
+                part_id="spur_gear",
+                parameters=gear_params,
+                confidence=0.6,
+                reasoning="Mechanism type indicates gear",
+                quantity=2
+            ))
+
+    if _MECH_PATTERNS["shaft"].search(mechanism):
+        if not any(p.part_id == "shaft" for p in parts):
+            parts.append(PartSelection(
+                part_id="shaft",
+                parameters={},
+                confidence=0.5,
+                reasoning="Mechanism requires shaft",
+                quantity=1
+            ))
 
     # 接続方法を確認
-    connections = (intent.get("connections") or "").lower()
-    if "bolt" in connections or "ボルト" in connections:
-        parts.append({
-            "part_id": "bolt",
-            "parameters": {"size": "M5"},
-            "confidence": 0.7,
-            "reasoning": "Connection method requires bolts",
-            "quantity": 4
-        })
-        parts.append({
-            "part_id": "nut",
-            "parameters": {"size": "M5"},
-            "confidence": 0.7,
-            "reasoning": "Bolts require nuts",
-            "quantity": 4
-        })
+    connections = intent.get("connections") or ""
+    if _CONN_PATTERNS["bolt"].search(connections):
+        parts.append(PartSelection(
+            part_id="bolt",
+            parameters={"size": "M5"},
+            confidence=0.7,
+            reasoning="Connection method requires bolts",
+            quantity=4
+        ))
+        parts.append(PartSelection(
+            part_id="nut",
+            parameters={"size": "M5"},
+            confidence=0.7,
+            reasoning="Bolts require nuts",
+            quantity=4
+        ))
 
     return parts
 
@@ -1,5 +1,7 @@
 ﻿import math
 
+import numpy as np
+
 HOLE_CLEARANCE_MM = {
     "M3": 3.4,
     "M4": 4.5,
@@ -8,6 +10,9 @@ HOLE_CLEARANCE_MM = {
     "M8": 9.0,
 }
 
+_TRUE_STRINGS = frozenset({"y", "yes", "true", "1"})
+_FALSE_STRINGS = frozenset({"n", "no", "false", "0"})
+
 INTENT_FIELDS = [
     ("intent_summary", "この部品で実現したいこと（概要）"),
     ("function_primary", "主機能（何をする部品か）"),
@@ -90,6 +95,8 @@ INTENT_FIELDS = [
     ("gear_lubrication", "歯車: 潤滑の要否"),
 ]
 
+_INTENT_FIELD_IDS = tuple(qid for qid, _ in INTENT_FIELDS)
+
 
 def _hole_radii_px(vision):
     return [h.get("radius_px") for h in vision.get("holes", []) if h.get("radius_px") is not None]
@@ -105,6 +112,20 @@ def _holes_vary(radii):
     return math.sqrt(variance) / mean > 0.08
 
 
+def _outline_width(outline):
+    # 点数が多い場合はNumPyで一括、少ない場合は1パスのループで求める
+    if len(outline) > 64:
+        return float(np.ptp(np.asarray(outline, dtype=np.float64)[:, 0]))
+    xmin = xmax = outline[0][0]
+    for p in outline:
+        x = p[0]
+        if x < xmin:
+            xmin = x
+        elif x > xmax:
+            xmax = x
+    return xmax - xmin
+
+
 def _parse_hole_standard(value):
     if not value:
         return None
@@ -120,9 +141,9 @@ def _parse_bool(value):
     if isinstance(value, bool):
         return value
     text = str(value).strip().lower()
-    if text in {"y", "yes", "true", "1"}:
+    if text in _TRUE_STRINGS:
         return True
-    if text in {"n", "no", "false", "0"}:
+    if text in _FALSE_STRINGS:
         return False
     return None
 
@@ -188,8 +209,11 @@ def build_model_questions(vision, params, inferred_part=None):
                 }
             )
 
+    # _has_value をインライン展開（全フィールド分の関数呼び出しを避ける）
+    get = params.get
     for qid, text in INTENT_FIELDS:
-        if not _has_value(params.get(qid)):
+        v = get(qid)
+        if v is None or (isinstance(v, str) and not v.strip()):
             questions.append({"id": qid, "text": text, "type": "text"})
 
     if has_holes and not _has_value(params.get("connections")):
@@ -222,8 +246,7 @@ def resolve_params(vision, params, prompt_fn=None, include_intent=False, inferre
 
     outline = vision.get("outline", {}).get("points_px", [])
     if px_to_mm is None and plate_width_mm and outline:
-        xs = [p[0] for p in outline]
-        width_px = max(xs) - min(xs)
+        width_px = _outline_width(outline)
         if width_px > 0:
             px_to_mm = float(plate_width_mm) / float(width_px)
 
@@ -273,7 +296,7 @@ def resolve_params(vision, params, prompt_fn=None, include_intent=False, inferre
         "part_type_confirm": answer_map.get("part_type_confirm") or params.get("part_type_confirm"),
     }
 
-    for qid, _ in INTENT_FIELDS:
+    for qid in _INTENT_FIELD_IDS:
         if qid in {"intent_summary"}:
             continue
         intent[qid] = answer_map.get(qid) or params.get(qid)
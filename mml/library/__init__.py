@@ -10,7 +10,7 @@
 from .catalog import PartsCatalog, PartDefinition, get_catalog
 from .selector import PartSelector, select_parts_for_intent
 from .generator import generate_part_mesh, PartGenerationResult
-from .validators import validate_parameters, fill_defaults
+from .validators import ValidationIssue, validate_parameters, fill_defaults
 
 __all__ = [
     # カタログ
@@ -24,6 +24,7 @@ __all__ = [
     "generate_part_mesh",
     "PartGenerationResult",
     # 検証
+    "ValidationIssue",
     "validate_parameters",
     "fill_defaults",
 ]
@@ -8,10 +8,14 @@
 """
 
 import json
-from typing import Dict, List, Optional, Any
+from types import CodeType
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 
+# 寸法として扱うパラメータ単位
+_DIMENSION_UNITS = frozenset(("mm", "m", "cm", "inch"))
+
 
 @dataclass
 class PartDefinition:
@@ -28,6 +32,31 @@ class PartDefinition:
     generator: Dict[str, str]
     compatible_with: List[str] = field(default_factory=list)
     assembly_hints: Dict[str, Any] = field(default_factory=dict)
+    # 式制約（kind == "expression"）を読み込み時にコンパイルしたもの。
+    # (コードオブジェクト, 失敗時メッセージ) の組で、validators.validate_parameters が評価する
+    compiled_constraints: List[Tuple[CodeType, str]] = field(
+        init=False, default_factory=list, repr=False, compare=False
+    )
+    # 単位が寸法（mm など）のパラメータ名。validators.apply_scale がスケール対象とする
+    dim_params: Tuple[str, ...] = field(
+        init=False, default=(), repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.dim_params = tuple(
+            name for name, spec in self.parameters.items()
+            if spec.get("unit", "") in _DIMENSION_UNITS
+        )
+        for constraint in self.constraints:
+            if constraint.get("kind") != "expression":
+                continue
+            expr = constraint.get("expression", "")
+            try:
+                code = compile(expr, f"<constraint:{self.id}>", "eval")
+            except SyntaxError:
+                continue  # 不正な式は無視
+            message = constraint.get("message", f"Constraint failed: {expr}")
+            self.compiled_constraints.append((code, message))
 
     @classmethod
     def from_json(cls, data: dict) -> "PartDefinition":
@@ -80,12 +109,14 @@ class PartsCatalog:
         self._parts: Dict[str, PartDefinition] = {}
         self._keyword_index: Dict[str, List[str]] = {}  # キーワード -> [part_id]
         self._category_index: Dict[str, List[str]] = {}  # カテゴリ -> [part_id]
+        self._prompt_text: Optional[str] = None  # prompt_text のキャッシュ
 
     def load(self) -> None:
         """JSONファイルから部品定義を読み込む。"""
         self._parts.clear()
         self._keyword_index.clear()
         self._category_index.clear()
+        self._prompt_text = None
 
         if not self.parts_dir.exists():
             return
@@ -165,6 +196,37 @@ class PartsCatalog:
                     lines.append(f"  Context: {context}")
         return "\n".join(lines)
 
+    @property
+    def prompt_text(self) -> str:
+        """AI向けのカタログ説明（初回参照時に作成し、load() で破棄する）。"""
+        if self._prompt_text is None:
+            self._prompt_text = self._build_prompt_text()
+        return self._prompt_text
+
+    def _build_prompt_text(self) -> str:
+        lines = ["## Available Parts Library\n"]
+
+        for category in sorted(self._category_index.keys()):
+            lines.append(f"\n### {category.title()}")
+
+            # 読み込み順はファイルシステム依存なのでIDで並べ、プロセス間でも同一の文面にする
+            for part_id in sorted(self._category_index[category]):
+                part = self._parts[part_id]
+                name = part.get_name("ja")
+                lines.append(f"\n**{part.id}** ({name})")
+
+                if part.ai_context:
+                    lines.append(f"  使用場面: {part.ai_context}")
+
+                lines.append("  パラメータ:")
+                for param_name, param_def in list(part.parameters.items())[:5]:
+                    desc = param_def.get("description", {}).get("ja", param_name)
+                    default = param_def.get("default")
+                    unit = param_def.get("unit", "")
+                    lines.append(f"    - {param_name}: {desc} (default: {default}{unit})")
+
+        return "\n".join(lines)
+
     def get_parts_for_ai(self) -> List[Dict[str, Any]]:
         """AIプロンプト用に整形した部品情報を取得する。"""
         result = []
@@ -4,15 +4,18 @@
 定義に基づき適切な生成関数へディスパッチする。
 """
 
+from __future__ import annotations
+
 import importlib
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from dataclasses import dataclass
 
-import trimesh
-
 from .catalog import PartDefinition, get_catalog
 from .validators import validate_parameters, fill_defaults, coerce_parameters, apply_scale
 
+if TYPE_CHECKING:
+    import trimesh
+
 
 @dataclass
 class PartGenerationResult:
@@ -0,0 +1,406 @@
+"""
+生成関数で共有する形状ヘルパー。
+
+2D輪郭（円・六角形）、押し出し、環状体、メッシュ連結を各生成モジュールで共用する。
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from . import _numeric
+
+# trimesh/shapely は読み込みが重いため、実際にメッシュを作る関数内で import する
+if TYPE_CHECKING:
+    import trimesh
+
+
+# 円の分割数を決める既定の弦高誤差 [mm]
+DEFAULT_CHORDAL_TOL = 0.05
+_MIN_SEGMENTS = 8
+_MAX_SEGMENTS = 512
+
+# circle_points のキャッシュキーに使う丸め桁数
+_CIRCLE_KEY_DECIMALS = 6
+
+# 外接円半径1の六角形（角-角方向、30度から開始）
+_HEX_UNIT = np.array([
+    [math.cos(math.pi / 6 + i * math.pi / 3), math.sin(math.pi / 6 + i * math.pi / 3)]
+    for i in range(6)
+])
+
+# 生成済みメッシュのキャッシュ（(関数, キーワード引数) -> メッシュ）
+_MESH_CACHE: Dict[Tuple[Any, ...], trimesh.Trimesh] = {}
+_MESH_CACHE_SIZE = 256
+
+
+def cached_generator(func: Callable[..., trimesh.Trimesh]) -> Callable[..., trimesh.Trimesh]:
+    """
+    同じキーワード引数での生成結果をキャッシュするデコレータ。
+
+    キャッシュ本体は呼び出し側に渡さず、常にコピーを返す。
+    位置引数やハッシュ不能な値を含む呼び出しはキャッシュしない。
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if args:
+            return func(*args, **kwargs)
+        key = (name, tuple(sorted(kwargs.items())))
+        try:
+            mesh = _MESH_CACHE.get(key)
+        except TypeError:
+            return func(**kwargs)
+        if mesh is None:
+            mesh = func(**kwargs)
+            if len(_MESH_CACHE) >= _MESH_CACHE_SIZE:
+                # 最も古いエントリを破棄（dict は挿入順を保持）
+                _MESH_CACHE.pop(next(iter(_MESH_CACHE)))
+            _MESH_CACHE[key] = mesh
+        return mesh.copy()
+
+    return wrapper
+
+
+def segments_for_radius(radius: float, chordal_tol: float = DEFAULT_CHORDAL_TOL) -> int:
+    """
+    弦高誤差が chordal_tol 以下になる円の分割数を返す。
+
+    小径の穴ほど分割数が少なくなる（最小8、最大512）。
+    """
+    if radius <= 0 or chordal_tol <= 0:
+        return _MIN_SEGMENTS if radius <= 0 else _MAX_SEGMENTS
+    # acos の定義域に収める（許容誤差が直径を超える場合は最小分割）
+    cos_half = max(1.0 - chordal_tol / radius, -1.0)
+    half_angle = math.acos(cos_half)
+    if half_angle <= 0:
+        return _MAX_SEGMENTS
+    return min(max(_MIN_SEGMENTS, int(math.ceil(math.pi / half_angle))), _MAX_SEGMENTS)
+
+
+def translation_matrix(offset: Tuple[float, float, float]) -> np.ndarray:
+    """平行移動の (4, 4) 変換行列を返す。"""
+    matrix = np.eye(4)
+    matrix[:3, 3] = offset
+    return matrix
+
+
+def circle_points(center: Tuple[float, float], radius: float, segments: int = 48) -> np.ndarray:
+    """
+    円周上の点を (segments, 2) 配列で生成する。
+
+    同じ径の穴は繰り返し現れるため結果をキャッシュし、読み取り専用の配列を返す。
+    """
+    return _circle_points_cached(
+        round(float(center[0]), _CIRCLE_KEY_DECIMALS),
+        round(float(center[1]), _CIRCLE_KEY_DECIMALS),
+        round(float(radius), _CIRCLE_KEY_DECIMALS),
+        int(segments),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _circle_points_cached(cx: float, cy: float, radius: float, segments: int) -> np.ndarray:
+    points = _numeric.circle_points(cx, cy, radius, segments)
+    points.setflags(write=False)
+    return points
+
+
+def hexagon_points(center: Tuple[float, float], flat_to_flat: float) -> np.ndarray:
+    """六角形の点列を (6, 2) 配列で生成する（角-角方向）。"""
+    # 六角ナットでは対辺距離が二面幅
+    # 角までの半径 = 対辺距離 / sqrt(3)
+    radius = flat_to_flat / math.sqrt(3)
+    return np.asarray(center, dtype=np.float64) + radius * _HEX_UNIT
+
+
+def extrude_triangulation(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    height: float,
+    z_offset: float = 0.0
+) -> trimesh.Trimesh:
+    """
+    2D三角形分割を押し出し、頂点を共有した閉じたメッシュを返す。
+
+    底面・上面は分割をそのまま使い、側面は境界辺（逆向きの辺が無い辺）から張る。
+    頂点は構築時点で共有されているため process=False で作り、
+    merge_vertices などの後処理を省く。
+    """
+    import trimesh
+
+    n = len(vertices)
+    tri = vertices[faces]
+    d1 = tri[:, 1] - tri[:, 0]
+    d2 = tri[:, 2] - tri[:, 0]
+    if (d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]).sum() < 0:
+        faces = faces[:, ::-1]  # 反時計回りにそろえる
+
+    edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    boundary = edges[~np.isin(edges[:, 0] * n + edges[:, 1], edges[:, 1] * n + edges[:, 0])]
+    a, b = boundary[:, 0], boundary[:, 1]
+
+    out_vertices = np.empty((2 * n, 3))
+    out_vertices[:n, :2] = vertices
+    out_vertices[n:, :2] = vertices
+    out_vertices[:n, 2] = z_offset
+    out_vertices[n:, 2] = z_offset + height
+    out_faces = np.concatenate([
+        faces[:, ::-1],                      # 底面（-Z向き）
+        faces + n,                           # 上面（+Z向き）
+        np.stack([a, b, b + n], axis=1),     # 側面
+        np.stack([a, b + n, a + n], axis=1),
+    ])
+    return trimesh.Trimesh(vertices=out_vertices, faces=out_faces, process=False)
+
+
+def _disc_triangulation(radius: float, sections: int) -> Tuple[np.ndarray, np.ndarray]:
+    """中心点と外周からなる円板の三角形分割を返す。"""
+    ring = np.arange(1, sections + 1)
+    vertices = np.vstack([(0.0, 0.0), circle_points((0, 0), radius, sections)])
+    faces = np.stack([np.zeros(sections, dtype=np.int64), ring, np.roll(ring, -1)], axis=1)
+    return vertices, faces
+
+
+def _annulus_triangulation(
+    r_inner: float,
+    r_outer: float,
+    sections: int,
+    inner_sections: Optional[int] = None
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    外周と内周を帯状につないだ環状の三角形分割を返す。
+
+    内周の分割数が外周と異なる場合は帯状につなげないため、earcut で分割する。
+    """
+    if inner_sections is not None and inner_sections != sections:
+        return triangulate_rings([
+            circle_points((0, 0), r_outer, sections),
+            circle_points((0, 0), r_inner, inner_sections),
+        ])
+    outer = np.arange(sections)
+    inner = outer + sections
+    outer_next = np.roll(outer, -1)
+    inner_next = np.roll(inner, -1)
+    vertices = np.vstack([
+        circle_points((0, 0), r_outer, sections),
+        circle_points((0, 0), r_inner, sections),
+    ])
+    faces = np.concatenate([
+        np.stack([outer, outer_next, inner_next], axis=1),
+        np.stack([outer, inner_next, inner], axis=1),
+    ])
+    return vertices, faces
+
+
+def cylinder(radius: float, height: float, sections: int = 32) -> trimesh.Trimesh:
+    """原点中心の円柱を生成する（trimesh.creation.cylinder と同じ配置、後処理なし）。"""
+    vertices, faces = _disc_triangulation(radius, sections)
+    return extrude_triangulation(vertices, faces, height, z_offset=-height / 2.0)
+
+
+def annular_extrude(
+    r_outer: float,
+    r_inner: float,
+    height: float,
+    z_offset: float = 0.0,
+    sections: Optional[int] = None,
+    inner_sections: Optional[int] = None
+) -> Optional[trimesh.Trimesh]:
+    """
+    z=z_offset から立ち上がる同軸の円筒/環状体を生成する。
+
+    ボア1つだけの円板は汎用の三角形分割を介さず、帯状の分割から直接生成する。
+    sections 省略時は外径から分割数を決める。inner_sections 省略時は内周も同じ分割数とする。
+    """
+    if sections is None:
+        sections = segments_for_radius(r_outer)
+    if r_inner > 0:
+        triangulation = _annulus_triangulation(r_inner, r_outer, sections, inner_sections)
+        if triangulation is None:
+            return None
+        vertices, faces = triangulation
+    else:
+        vertices, faces = _disc_triangulation(r_outer, sections)
+    return extrude_triangulation(vertices, faces, height, z_offset=z_offset)
+
+
+def circle_rings(
+    centers: np.ndarray,
+    radius: float,
+    segments: int = 48
+) -> List[np.ndarray]:
+    """
+    同一半径の円（穴）を複数まとめて生成し、各円の閉じた点列を返す。
+
+    shapely の点バッファを一括で評価するため、円ごとのループが不要になる。
+    """
+    import shapely
+
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    if len(centers) == 0:
+        return []
+    quad_segs = max(2, int(math.ceil(segments / 4)))
+    discs = shapely.buffer(shapely.points(centers), radius, quad_segs=quad_segs)
+    coords = shapely.get_coordinates(shapely.get_exterior_ring(discs))
+    return list(coords.reshape(len(centers), -1, 2))
+
+
+def _largest_polygon(geom):
+    """修復で複数形状になった場合に最大の面を取り出す。"""
+    import shapely
+
+    parts = [g for g in shapely.get_parts(shapely.get_parts(geom)) if g.geom_type == "Polygon"]
+    if not parts:
+        return shapely.Polygon()
+    return max(parts, key=lambda g: g.area)
+
+
+def open_ring(points: Union[List[Tuple[float, float]], np.ndarray]) -> np.ndarray:
+    """点列を float64 配列にし、末尾の閉じ点があれば除く。"""
+    ring = np.asarray(points, dtype=np.float64)
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    return ring
+
+
+def extrude_profile(
+    outline: Union[List[Tuple[float, float]], np.ndarray],
+    holes: List[Union[List[Tuple[float, float]], np.ndarray]],
+    height: float,
+    z_offset: float = 0.0,
+    trusted: bool = False
+) -> Optional[trimesh.Trimesh]:
+    """
+    穴付き2Dプロファイルを3Dに押し出す。
+
+    妥当な形状は入力の点列のまま三角形分割し、Shapely は妥当性の判定にだけ使う。
+    構成上妥当と分かっている形状は trusted=True で判定自体を省く。
+    """
+    import shapely
+
+    rings = [open_ring(outline), *(open_ring(h) for h in holes)]
+    if trusted:
+        triangulation = triangulate_rings(rings)
+        if triangulation is None:
+            return None
+        return extrude_triangulation(*triangulation, height, z_offset=z_offset)
+
+    poly = shapely.polygons(
+        shapely.linearrings(rings[0]),
+        holes=[shapely.linearrings(r) for r in rings[1:]] or None,
+    )
+    if shapely.is_valid(poly):
+        triangulation = triangulate_rings(rings)
+    else:
+        # 不正な形状のみ修復し、修復後のポリゴンから点列を取り出す
+        poly = shapely.make_valid(poly)
+        if poly.geom_type != "Polygon":
+            poly = _largest_polygon(poly)
+        if shapely.is_empty(poly):
+            return None
+        triangulation = triangulate_polygon(poly)
+    if triangulation is None:
+        return None
+    return extrude_triangulation(*triangulation, height, z_offset=z_offset)
+
+
+def triangulate_rings(rings: List[np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    外周と穴の点列（閉じ点なし）を mapbox_earcut で直接三角形分割する。
+
+    全輪郭を1つの配列にまとめ、輪郭の終端インデックスと共に1回で渡す。
+    閉じ点を含まないため、押し出し時に頂点がそのまま共有される。
+    """
+    import mapbox_earcut
+
+    vertices = np.ascontiguousarray(np.vstack(rings), dtype=np.float64)
+    ring_ends = np.cumsum([len(r) for r in rings]).astype(np.uint32)
+    try:
+        indices = mapbox_earcut.triangulate_float64(vertices, ring_ends)
+    except Exception:
+        return None
+    if len(indices) == 0:
+        return None
+    return vertices, indices.reshape(-1, 3).astype(np.int64)
+
+
+def triangulate_polygon(poly) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """穴付きの Shapely ポリゴンを triangulate_rings で三角形分割する。"""
+    import shapely
+
+    rings = [poly.exterior, *poly.interiors]
+    return triangulate_rings([shapely.get_coordinates(ring)[:-1] for ring in rings])
+
+
+def fast_concat(
+    meshes: List[trimesh.Trimesh],
+    transforms: Optional[List[Optional[np.ndarray]]] = None
+) -> trimesh.Trimesh:
+    """
+    メッシュを頂点/面配列の連結だけで結合する。
+
+    部品同士は互いに離れているため、trimesh.util.concatenate の
+    検証・隣接再計算は行わず process=False で構築する。
+    transforms を渡すと各メッシュの (4, 4) 変換を連結時の1回の行列積で適用する
+    （apply_translation/apply_transform による頂点コピーを省く）。
+    """
+    import trimesh
+
+    if len(meshes) == 1 and (transforms is None or transforms[0] is None):
+        return meshes[0]
+    if transforms is None:
+        transforms = [None] * len(meshes)
+    counts_v = [len(m.vertices) for m in meshes]
+    counts_f = [len(m.faces) for m in meshes]
+    offsets_v = np.cumsum([0] + counts_v)
+    offsets_f = np.cumsum([0] + counts_f)
+
+    vertices = np.empty((offsets_v[-1], 3), dtype=np.float64)
+    faces = np.empty((offsets_f[-1], 3), dtype=np.int64)
+    for i, m in enumerate(meshes):
+        matrix = transforms[i]
+        if matrix is None:
+            vertices[offsets_v[i]:offsets_v[i + 1]] = m.vertices
+        else:
+            np.matmul(m.vertices, matrix[:3, :3].T, out=vertices[offsets_v[i]:offsets_v[i + 1]])
+            vertices[offsets_v[i]:offsets_v[i + 1]] += matrix[:3, 3]
+        faces[offsets_f[i]:offsets_f[i + 1]] = m.faces + offsets_v[i]
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+def instance_mesh(mesh: trimesh.Trimesh, transforms: np.ndarray) -> trimesh.Trimesh:
+    """
+    同じメッシュを (k, 4, 4) の配置行列ごとに複製し、1つのメッシュとして返す。
+
+    頂点変換は einsum 1回で行い、面は頂点オフセットを加えて並べる。
+    """
+    import trimesh
+
+    vertices = np.einsum("kij,nj->kni", transforms[:, :3, :3], mesh.vertices)
+    vertices += transforms[:, None, :3, 3]
+    offsets = np.arange(len(transforms))[:, None, None] * len(mesh.vertices)
+    faces = mesh.faces[None, :, :] + offsets
+    return trimesh.Trimesh(
+        vertices=vertices.reshape(-1, 3), faces=faces.reshape(-1, 3), process=False
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _boolean_engine() -> Optional[str]:
+    """ブーリアンエンジンを初回使用時に決める（manifold3d は任意依存）。"""
+    try:
+        import manifold3d  # noqa: F401  プロセス内ブーリアン
+    except ImportError:
+        return None  # trimesh の既定エンジンに任せる
+    return "manifold"
+
+
+def boolean_difference(mesh: trimesh.Trimesh, other: trimesh.Trimesh) -> trimesh.Trimesh:
+    """ブーリアン差を計算する（manifold3d があればサブプロセスを起動しない）。"""
+    return mesh.difference(other, engine=_boolean_engine())
@@ -0,0 +1,105 @@
+"""
+生成関数の数値カーネル。
+
+歯形は Numba が利用可能な場合に JIT コンパイル版を使い、
+無い場合は同じ結果を返す NumPy 版にフォールバックする。
+"""
+
+import functools
+import importlib.util
+import math
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# Numba は任意依存。読み込みが重いため、ここでは有無だけ調べて歯形の初回計算時に import する
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# 歯形1枚あたりの主要点（歯元 → 歯面 → 歯先 → 歯面 → 歯元）の角度係数
+_TOOTH_OFFSETS = np.array([-1.4, -0.8, -0.3, 0.0, 0.3, 0.8, 1.4])
+
+# 分割数ごとの単位円の点列
+_UNIT_CIRCLES: Dict[int, np.ndarray] = {}
+
+
+def _tooth_radii(module: float, teeth_count: int) -> np.ndarray:
+    """歯形主要点の半径を返す。"""
+    pitch_radius = module * teeth_count / 2.0
+    outer_radius = pitch_radius + module
+    root_radius = max(pitch_radius - 1.25 * module, module)
+    return np.array([
+        root_radius,            # 歯元開始
+        pitch_radius * 0.95,    # 下側歯面
+        outer_radius * 0.98,    # 上側歯面
+        outer_radius,           # 歯先中心
+        outer_radius * 0.98,    # 上側歯面
+        pitch_radius * 0.95,    # 下側歯面
+        root_radius,            # 歯元終端
+    ])
+
+
+def _tooth_profile_np(radii: np.ndarray, teeth_count: int) -> np.ndarray:
+    tooth_angle = math.tau / teeth_count
+    offsets = _TOOTH_OFFSETS * (tooth_angle * 0.25)
+    angles = np.arange(teeth_count)[:, None] * tooth_angle + offsets[None, :]
+    x = radii * np.cos(angles)
+    y = radii * np.sin(angles)
+    return np.stack([x.ravel(), y.ravel()], axis=1)
+
+
+def _unit_circle(segments: int) -> np.ndarray:
+    """単位円の点列を返す（三角関数は分割数ごとに1回だけ計算）。"""
+    unit = _UNIT_CIRCLES.get(segments)
+    if unit is None:
+        theta = np.linspace(0.0, math.tau, segments, endpoint=False)
+        unit = np.stack([np.cos(theta), np.sin(theta)], axis=1)
+        _UNIT_CIRCLES[segments] = unit
+    return unit
+
+
+# 取付穴で使う32分割の単位円は import 時に用意しておく
+_unit_circle(32)
+
+
+def _circle_points_np(cx: float, cy: float, radius: float, unit: np.ndarray) -> np.ndarray:
+    return np.array((cx, cy)) + radius * unit
+
+
+@functools.lru_cache(maxsize=None)
+def _tooth_profile_nb() -> Optional[Callable[[np.ndarray, int], np.ndarray]]:
+    """Numba 版の歯形カーネルを返す（import できない場合は None）。"""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def kernel(radii, teeth_count):
+        tooth_angle = math.tau / teeth_count
+        half = tooth_angle * 0.25
+        n = radii.shape[0]
+        out = np.empty((teeth_count * n, 2))
+        for i in range(teeth_count):
+            base = i * tooth_angle
+            for j in range(n):
+                angle = base + _TOOTH_OFFSETS[j] * half
+                out[i * n + j, 0] = radii[j] * math.cos(angle)
+                out[i * n + j, 1] = radii[j] * math.sin(angle)
+        return out
+
+    return kernel
+
+
+def tooth_profile(module: float, teeth_count: int) -> np.ndarray:
+    """全歯の歯形主要点を (teeth_count * 7, 2) 配列で返す。"""
+    radii = _tooth_radii(module, teeth_count)
+    kernel = _tooth_profile_nb() if NUMBA_AVAILABLE else None
+    if kernel is not None:
+        return kernel(radii, int(teeth_count))
+    return _tooth_profile_np(radii, int(teeth_count))
+
+
+def circle_points(cx: float, cy: float, radius: float, segments: int) -> np.ndarray:
+    """円周上の点を (segments, 2) 配列で返す（単位円テーブルを拡大・平行移動）。"""
+    unit = _unit_circle(int(segments))
+    return _circle_points_np(float(cx), float(cy), float(radius), unit)
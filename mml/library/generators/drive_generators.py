@@ -2,50 +2,81 @@
 駆動部品のメッシュ生成関数。
 """
 
+from __future__ import annotations
+
 import math
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from ._geom import (
+    DEFAULT_CHORDAL_TOL,
+    annular_extrude as _annular_extrude,
+    cached_generator as _cached_generator,
+    circle_points as _circle_points,
+    circle_rings as _circle_rings,
+    cylinder as _cylinder,
+    extrude_profile as _extrude_profile,
+    fast_concat as _fast_concat,
+    instance_mesh as _instance_mesh,
+    segments_for_radius as _segments_for_radius,
+    translation_matrix as _translation,
+)
+
+if TYPE_CHECKING:
+    import trimesh
+
+
+def _motor_body(body_diameter_mm: float, body_length_mm: float, chordal_tol: float) -> trimesh.Trimesh:
+    """モータ本体円筒を原点中心で生成する。"""
+    body = _cylinder(
+        radius=body_diameter_mm / 2.0,
+        height=body_length_mm,
+        sections=_segments_for_radius(body_diameter_mm / 2.0, chordal_tol)
+    )
+    return body
 
-import trimesh
-from shapely.geometry import Polygon
 
+def _motor_flange(
+    flange_diameter_mm: float,
+    flange_thickness_mm: float,
+    mounting_hole_diameter_mm: float,
+    mounting_hole_pcd_mm: float,
+    mounting_holes_count: int,
+    chordal_tol: float
+) -> Optional[trimesh.Trimesh]:
+    """取付穴付きの前面フランジを z=0 から生成する。"""
+    flange_outline = _circle_points(
+        (0, 0), flange_diameter_mm / 2.0, _segments_for_radius(flange_diameter_mm / 2.0, chordal_tol)
+    )
+    flange_holes = []
 
-def _circle_points(center: Tuple[float, float], radius: float, segments: int = 48) -> List[Tuple[float, float]]:
-    """円周上の点を生成する。"""
-    cx, cy = center
-    pts = []
-    for i in range(segments):
-        theta = 2.0 * math.pi * i / segments
-        x = cx + radius * math.cos(theta)
-        y = cy + radius * math.sin(theta)
-        pts.append((x, y))
-    return pts
+    # PCD上の取付穴
+    if mounting_holes_count > 0 and mounting_hole_pcd_mm > 0:
+        hole_radius = mounting_hole_diameter_mm / 2.0
+        pcd_radius = mounting_hole_pcd_mm / 2.0
+        angles = np.arange(mounting_holes_count) * (math.tau / mounting_holes_count) + np.pi / 4  # 45度オフセット
+        centers = pcd_radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        flange_holes = _circle_rings(centers, hole_radius, _segments_for_radius(hole_radius, chordal_tol))
 
+    return _extrude_profile(flange_outline, flange_holes, flange_thickness_mm)
 
-def _extrude_profile(
-    outline: List[Tuple[float, float]],
-    holes: List[List[Tuple[float, float]]],
-    height: float,
-    z_offset: float = 0.0
-) -> Optional[trimesh.Trimesh]:
-    """穴付き2Dプロファイルを3Dに押し出す。"""
-    poly = Polygon(outline, holes)
-    if not poly.is_valid:
-        poly = poly.buffer(0)
-    if poly.is_empty:
-        return None
-
-    try:
-        mesh = trimesh.creation.extrude_polygon(
-            poly, height=height,
-            triangulate_kwargs={"engine": "earcut"}
-        )
-        if z_offset:
-            mesh.apply_translation((0.0, 0.0, z_offset))
-        return mesh
-    except Exception:
-        return None
+
+def _motor_shaft(
+    shaft_diameter_mm: float,
+    shaft_length_mm: float,
+    chordal_tol: float
+) -> trimesh.Trimesh:
+    """出力軸を原点中心で生成する。"""
+    shaft = _cylinder(
+        radius=shaft_diameter_mm / 2.0,
+        height=shaft_length_mm,
+        sections=_segments_for_radius(shaft_diameter_mm / 2.0, chordal_tol)
+    )
+    return shaft
 
 
+@_cached_generator
 def generate_motor(
     body_diameter_mm: float = 42.0,
     body_length_mm: float = 40.0,
@@ -56,52 +87,34 @@ def generate_motor(
     mounting_hole_diameter_mm: float = 3.0,
     mounting_hole_pcd_mm: float = 31.0,
     mounting_holes_count: int = 4,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
     モータのメッシュを生成する（NEMA風）。
     """
-    meshes = []
-
-    # 本体円筒
-    body = trimesh.creation.cylinder(
-        radius=body_diameter_mm / 2.0,
-        height=body_length_mm,
-        sections=64
-    )
-    body.apply_translation((0, 0, body_length_mm / 2.0))
-    meshes.append(body)
-
-    # 前面フランジ
-    flange_outline = _circle_points((0, 0), flange_diameter_mm / 2.0, 64)
-    flange_holes = []
-
-    # PCD上の取付穴
-    if mounting_holes_count > 0 and mounting_hole_pcd_mm > 0:
-        hole_radius = mounting_hole_diameter_mm / 2.0
-        pcd_radius = mounting_hole_pcd_mm / 2.0
-        for i in range(mounting_holes_count):
-            angle = 2 * math.pi * i / mounting_holes_count + math.pi / 4  # 45度オフセット
-            hx = pcd_radius * math.cos(angle)
-            hy = pcd_radius * math.sin(angle)
-            flange_holes.append(_circle_points((hx, hy), hole_radius, 32))
-
-    flange_mesh = _extrude_profile(flange_outline, flange_holes, flange_thickness_mm)
-    if flange_mesh:
-        flange_mesh.apply_translation((0, 0, body_length_mm))
-        meshes.append(flange_mesh)
-
-    # 出力軸
+    # 配置は変換行列として持ち、連結時にまとめて適用する
+    parts = [
+        (_motor_body(body_diameter_mm, body_length_mm, chordal_tol),
+         _translation((0, 0, body_length_mm / 2.0))),
+        (_motor_flange(
+            flange_diameter_mm, flange_thickness_mm,
+            mounting_hole_diameter_mm, mounting_hole_pcd_mm, mounting_holes_count, chordal_tol
+        ), _translation((0, 0, body_length_mm))),
+    ]
     if shaft_diameter_mm > 0 and shaft_length_mm > 0:
-        shaft = trimesh.creation.cylinder(
-            radius=shaft_diameter_mm / 2.0,
-            height=shaft_length_mm,
-            sections=32
-        )
-        shaft.apply_translation((0, 0, body_length_mm + flange_thickness_mm + shaft_length_mm / 2.0))
-        meshes.append(shaft)
+        parts.append((
+            _motor_shaft(shaft_diameter_mm, shaft_length_mm, chordal_tol),
+            _translation((0, 0, body_length_mm + flange_thickness_mm + shaft_length_mm / 2.0)),
+        ))
 
-    return trimesh.util.concatenate(meshes)
+    meshes = []
+    transforms = []
+    for mesh, placement in parts:
+        if mesh:
+            meshes.append(mesh)
+            transforms.append(placement)
+    return _fast_concat(meshes, transforms)
 
 
 def generate_shaft(
@@ -111,74 +124,70 @@ def generate_shaft(
     keyway_width_mm: float = 3.0,
     keyway_depth_mm: float = 1.5,
     keyway_length_mm: float = 20.0,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
     軸のメッシュを生成する。
     """
-    shaft = trimesh.creation.cylinder(
-        radius=diameter_mm / 2.0,
-        height=length_mm,
-        sections=64
-    )
-    shaft.apply_translation((0, 0, length_mm / 2.0))
+    from shapely.geometry import Polygon, box
+
+    radius = diameter_mm / 2.0
+    sections = _segments_for_radius(radius, chordal_tol)
 
     if keyway:
-        # キー溝の切り欠きを作成
-        keyway_mesh = trimesh.creation.box(
-            extents=(keyway_width_mm, diameter_mm, keyway_length_mm)
+        # キー溝は断面円から矩形を2Dで差し引き、溝のある区間だけ押し出す（3Dブーリアン不要）
+        keyway_length = min(keyway_length_mm, length_mm)
+        disc = Polygon(_circle_points((0, 0), radius, sections))
+        slot = box(
+            -keyway_width_mm / 2.0, radius - keyway_depth_mm,
+            keyway_width_mm / 2.0, radius + keyway_depth_mm
         )
-        # 軸上端に配置
-        keyway_mesh.apply_translation((
-            0,
-            diameter_mm / 2.0 - keyway_depth_mm / 2.0,
-            length_mm - keyway_length_mm / 2.0
-        ))
-        try:
-            shaft = shaft.difference(keyway_mesh, engine="blender")
-        except Exception:
-            pass  # ブーリアン失敗時はキー溝なしで返す
+        profile = disc.difference(slot)
+        keyed = None
+        if profile.geom_type == "Polygon" and not profile.is_empty:
+            # GEOS の差分結果なので妥当性判定は不要
+            keyed = _extrude_profile(
+                np.asarray(profile.exterior.coords), [], keyway_length,
+                z_offset=length_mm - keyway_length, trusted=True
+            )
+        if keyed is not None:
+            plain_length = length_mm - keyway_length
+            if plain_length <= 0:
+                return keyed
+            plain = _cylinder(radius=radius, height=plain_length, sections=sections)
+            plain.apply_translation((0, 0, plain_length / 2.0))
+            return _fast_concat([plain, keyed])
+        # 断面の生成に失敗した場合はキー溝なしで返す
+
+    shaft = _cylinder(
+        radius=radius,
+        height=length_mm,
+        sections=sections
+    )
+    shaft.apply_translation((0, 0, length_mm / 2.0))
 
     return shaft
 
 
+@_cached_generator
 def generate_bearing(
     outer_diameter_mm: float = 22.0,
     inner_diameter_mm: float = 8.0,
     width_mm: float = 7.0,
     chamfer_mm: float = 0.5,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
     玉軸受のメッシュを生成する（簡略）。
     """
-    outer_outline = _circle_points((0, 0), outer_diameter_mm / 2.0, 64)
-    holes = []
-
-    # 内径ボア
-    if inner_diameter_mm > 0:
-        holes.append(_circle_points((0, 0), inner_diameter_mm / 2.0, 64))
-
-    mesh = _extrude_profile(outer_outline, holes, width_mm)
-
-    if mesh is None:
-        # フォールバック
-        outer = trimesh.creation.cylinder(
-            radius=outer_diameter_mm / 2.0,
-            height=width_mm,
-            sections=64
-        )
-        inner = trimesh.creation.cylinder(
-            radius=inner_diameter_mm / 2.0,
-            height=width_mm * 1.1,
-            sections=64
-        )
-        try:
-            mesh = outer.difference(inner, engine="blender")
-        except Exception:
-            mesh = outer
-
-    return mesh
+    # 内径ボア付きの円板なので環状体を直接生成する
+    outer_radius = outer_diameter_mm / 2.0
+    return _annular_extrude(
+        outer_radius, inner_diameter_mm / 2.0, width_mm,
+        sections=_segments_for_radius(outer_radius, chordal_tol)
+    )
 
 
 def generate_coupling(
@@ -187,6 +196,7 @@ def generate_coupling(
     length_mm: float = 30.0,
     coupling_type: str = "rigid",
     jaw_count: int = 3,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -195,80 +205,78 @@ def generate_coupling(
     if coupling_type == "jaw" or coupling_type == "spider":
         # ジョーカップリング（スパイダー）
         return _generate_jaw_coupling(
-            outer_diameter_mm, bore_diameter_mm, length_mm, jaw_count
+            outer_diameter_mm, bore_diameter_mm, length_mm, jaw_count, chordal_tol
         )
     else:
         # 簡易リジッドカップリング
         return _generate_rigid_coupling(
-            outer_diameter_mm, bore_diameter_mm, length_mm
+            outer_diameter_mm, bore_diameter_mm, length_mm, chordal_tol
         )
 
 
 def _generate_rigid_coupling(
     outer_diameter_mm: float,
     bore_diameter_mm: float,
-    length_mm: float
+    length_mm: float,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL
 ) -> trimesh.Trimesh:
     """簡易リジッドカップリングを生成する。"""
-    outer_outline = _circle_points((0, 0), outer_diameter_mm / 2.0, 64)
-    holes = []
-
-    if bore_diameter_mm > 0:
-        holes.append(_circle_points((0, 0), bore_diameter_mm / 2.0, 64))
+    outer_radius = outer_diameter_mm / 2.0
+    return _annular_extrude(
+        outer_radius, bore_diameter_mm / 2.0, length_mm,
+        sections=_segments_for_radius(outer_radius, chordal_tol)
+    )
 
-    mesh = _extrude_profile(outer_outline, holes, length_mm)
 
-    if mesh is None:
-        mesh = trimesh.creation.cylinder(
-            radius=outer_diameter_mm / 2.0,
-            height=length_mm,
-            sections=64
-        )
+def _jaw_transforms(jaw_count: int, jaw_radius: float, z_center: float) -> np.ndarray:
+    """
+    全ジョー歯の配置行列を (jaw_count, 4, 4) で返す。
 
-    return mesh
+    各歯は半径方向へ移動した後にZ軸回転するため、回転行列 R(a) と
+    移動量 R(a) @ (r cos a, r sin a, z) = (r cos 2a, r sin 2a, z) をまとめて計算する。
+    """
+    angles = np.arange(jaw_count) * (math.tau / jaw_count)
+    cos_a, sin_a = np.cos(angles), np.sin(angles)
+
+    transforms = np.zeros((jaw_count, 4, 4))
+    transforms[:, 0, 0] = cos_a
+    transforms[:, 0, 1] = -sin_a
+    transforms[:, 1, 0] = sin_a
+    transforms[:, 1, 1] = cos_a
+    transforms[:, 2, 2] = 1.0
+    transforms[:, 3, 3] = 1.0
+    transforms[:, 0, 3] = jaw_radius * np.cos(2 * angles)
+    transforms[:, 1, 3] = jaw_radius * np.sin(2 * angles)
+    transforms[:, 2, 3] = z_center
+    return transforms
 
 
 def _generate_jaw_coupling(
     outer_diameter_mm: float,
     bore_diameter_mm: float,
     length_mm: float,
-    jaw_count: int
+    jaw_count: int,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL
 ) -> trimesh.Trimesh:
     """ジョーカップリング片側を生成する。"""
-    meshes = []
+    import trimesh
 
     # 基本円筒
     base_height = length_mm * 0.3
-    base_outline = _circle_points((0, 0), outer_diameter_mm / 2.0, 64)
-    base_holes = []
-    if bore_diameter_mm > 0:
-        base_holes.append(_circle_points((0, 0), bore_diameter_mm / 2.0, 64))
+    outer_radius = outer_diameter_mm / 2.0
+    meshes = [_annular_extrude(
+        outer_radius, bore_diameter_mm / 2.0, base_height,
+        sections=_segments_for_radius(outer_radius, chordal_tol)
+    )]
 
-    base_mesh = _extrude_profile(base_outline, base_holes, base_height)
-    if base_mesh:
-        meshes.append(base_mesh)
-
-    # ジョー歯
+    # ジョー歯（同じ直方体を1つだけ作り、全歯の配置を一度に適用する）
     jaw_height = length_mm * 0.7
     jaw_radius = outer_diameter_mm / 2.0 * 0.85
-    jaw_width = 2 * math.pi * jaw_radius / (jaw_count * 2) * 0.8
-
-    for i in range(jaw_count):
-        angle = 2 * math.pi * i / jaw_count
-        jaw = trimesh.creation.box(
-            extents=(jaw_width, outer_diameter_mm * 0.3, jaw_height)
-        )
-        jaw.apply_translation((
-            jaw_radius * math.cos(angle),
-            jaw_radius * math.sin(angle),
-            base_height + jaw_height / 2.0
-        ))
-        jaw.apply_transform(trimesh.transformations.rotation_matrix(
-            angle, [0, 0, 1]
-        ))
-        meshes.append(jaw)
+    jaw_width = math.tau * jaw_radius / (jaw_count * 2) * 0.8
 
-    if not meshes:
-        return _generate_rigid_coupling(outer_diameter_mm, bore_diameter_mm, length_mm)
+    if jaw_count > 0:
+        jaw = trimesh.creation.box(extents=(jaw_width, outer_diameter_mm * 0.3, jaw_height))
+        transforms = _jaw_transforms(jaw_count, jaw_radius, base_height + jaw_height / 2.0)
+        meshes.append(_instance_mesh(jaw, transforms))
 
-    return trimesh.util.concatenate(meshes)
+    return _fast_concat(meshes)
@@ -2,63 +2,25 @@
 締結部品のメッシュ生成関数。
 """
 
-import math
-from typing import List, Tuple, Optional
-
-import trimesh
-from shapely.geometry import Polygon
-
-
-def _circle_points(center: Tuple[float, float], radius: float, segments: int = 48) -> List[Tuple[float, float]]:
-    """円周上の点を生成する。"""
-    cx, cy = center
-    pts = []
-    for i in range(segments):
-        theta = 2.0 * math.pi * i / segments
-        x = cx + radius * math.cos(theta)
-        y = cy + radius * math.sin(theta)
-        pts.append((x, y))
-    return pts
-
-
-def _hexagon_points(center: Tuple[float, float], flat_to_flat: float) -> List[Tuple[float, float]]:
-    """六角形の点列を生成する（角-角方向）。"""
-    cx, cy = center
-    # 六角ナットでは対辺距離が二面幅
-    # 角までの半径 = 対辺距離 / sqrt(3)
-    radius = flat_to_flat / math.sqrt(3)
-    pts = []
-    for i in range(6):
-        angle = math.pi / 6 + i * math.pi / 3  # 30度から開始
-        x = cx + radius * math.cos(angle)
-        y = cy + radius * math.sin(angle)
-        pts.append((x, y))
-    return pts
-
-
-def _extrude_profile(
-    outline: List[Tuple[float, float]],
-    holes: List[List[Tuple[float, float]]],
-    height: float,
-    z_offset: float = 0.0
-) -> Optional[trimesh.Trimesh]:
-    """穴付き2Dプロファイルを3Dに押し出す。"""
-    poly = Polygon(outline, holes)
-    if not poly.is_valid:
-        poly = poly.buffer(0)
-    if poly.is_empty:
-        return None
-
-    try:
-        mesh = trimesh.creation.extrude_polygon(
-            poly, height=height,
-            triangulate_kwargs={"engine": "earcut"}
-        )
-        if z_offset:
-            mesh.apply_translation((0.0, 0.0, z_offset))
-        return mesh
-    except Exception:
-        return None
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional
+
+from ._geom import (
+    DEFAULT_CHORDAL_TOL,
+    annular_extrude as _annular_extrude,
+    boolean_difference as _boolean_difference,
+    cached_generator as _cached_generator,
+    circle_points as _circle_points,
+    cylinder as _cylinder,
+    extrude_profile as _extrude_profile,
+    fast_concat as _fast_concat,
+    hexagon_points as _hexagon_points,
+    segments_for_radius as _segments_for_radius,
+)
+
+if TYPE_CHECKING:
+    import trimesh
 
 
 # メトリックボルト/ナットの標準寸法（概略）
@@ -73,11 +35,48 @@ METRIC_FASTENERS = {
 }
 
 
+class FastenerDims(NamedTuple):
+    """呼び径ごとの寸法（METRIC_FASTENERS から事前計算）。"""
+    nominal_dia: float
+    pitch: float
+    head_dia: float
+    head_height: float
+    nut_flat: float
+    nut_height: float
+
+
+# 呼び径 [mm]（"M5" -> 5.0）
+_NOMINAL_DIA: Dict[str, float] = {size: float(size[1:]) for size in METRIC_FASTENERS}
+
+_FASTENER_CACHE: Dict[str, FastenerDims] = {
+    size: FastenerDims(nominal_dia=_NOMINAL_DIA[size], **dims)
+    for size, dims in METRIC_FASTENERS.items()
+}
+
+
+def _fastener_dims(size: str) -> FastenerDims:
+    """
+    呼び径の寸法を返す。
+
+    未登録のサイズはM5の寸法に呼び径だけ反映する。
+    キャッシュは登録済みサイズだけを持ち、任意の入力文字列は追加しない。
+    """
+    dims = _FASTENER_CACHE.get(size)
+    if dims is None:
+        key = size.upper()
+        dims = _FASTENER_CACHE.get(key)
+        if dims is None:
+            dims = _FASTENER_CACHE["M5"]._replace(nominal_dia=float(key.replace("M", "")))
+    return dims
+
+
+@_cached_generator
 def generate_bolt(
     size: str = "M5",
     length_mm: float = 20.0,
     head_type: str = "hex",
     thread_length_mm: Optional[float] = None,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -88,74 +87,78 @@ def generate_bolt(
         length_mm: 全長（頭部を除く）
         head_type: "hex", "socket", "pan"
         thread_length_mm: ねじ長さ（Noneで全ねじ）
+        chordal_tol: 円の分割数を決める弦高誤差 [mm]
     """
     # サイズに対応する寸法を取得
-    dims = METRIC_FASTENERS.get(size.upper(), METRIC_FASTENERS["M5"])
-    nominal_dia = float(size.upper().replace("M", ""))
+    dims = _fastener_dims(size)
+    nominal_dia = dims.nominal_dia
 
     meshes = []
 
     # 頭部
     if head_type == "hex":
-        head_outline = _hexagon_points((0, 0), dims["head_dia"])
-        head_mesh = _extrude_profile(head_outline, [], dims["head_height"])
+        head_outline = _hexagon_points((0, 0), dims.head_dia)
+        # 穴のない凸六角形なので妥当性判定は不要
+        head_mesh = _extrude_profile(head_outline, [], dims.head_height, trusted=True)
         if head_mesh is None:
-            head_mesh = trimesh.creation.cylinder(
-                radius=dims["head_dia"] / 2.0,
-                height=dims["head_height"],
+            head_mesh = _cylinder(
+                radius=dims.head_dia / 2.0,
+                height=dims.head_height,
                 sections=6
             )
     elif head_type == "socket":
         # 六角穴付きボルト頭部
         head_dia = nominal_dia * 1.5
         head_height = nominal_dia
-        head_mesh = trimesh.creation.cylinder(
+        head_mesh = _cylinder(
             radius=head_dia / 2.0,
             height=head_height,
-            sections=64
+            sections=_segments_for_radius(head_dia / 2.0, chordal_tol)
         )
         # ソケット穴を追加
         socket_dia = nominal_dia * 0.9
         socket_depth = head_height * 0.6
-        socket = trimesh.creation.cylinder(
+        socket = _cylinder(
             radius=socket_dia / 2.0,
             height=socket_depth,
             sections=6  # 六角穴
         )
         socket.apply_translation((0, 0, head_height - socket_depth / 2.0))
         try:
-            head_mesh = head_mesh.difference(socket, engine="blender")
+            head_mesh = _boolean_difference(head_mesh, socket)
         except Exception:
             pass
     else:  # 皿頭
         head_dia = nominal_dia * 2.0
         head_height = nominal_dia * 0.6
-        head_mesh = trimesh.creation.cylinder(
+        head_mesh = _cylinder(
             radius=head_dia / 2.0,
             height=head_height,
-            sections=64
+            sections=_segments_for_radius(head_dia / 2.0, chordal_tol)
         )
 
     head_mesh.apply_translation((0, 0, head_mesh.bounds[1][2] - head_mesh.bounds[0][2]))
     meshes.append(head_mesh)
 
     # 軸部/ねじ部
-    shank = trimesh.creation.cylinder(
+    shank = _cylinder(
         radius=nominal_dia / 2.0,
         height=length_mm,
-        sections=32
+        sections=_segments_for_radius(nominal_dia / 2.0, chordal_tol)
     )
     head_top = head_mesh.bounds[1][2]
     shank.apply_translation((0, 0, head_top + length_mm / 2.0))
     meshes.append(shank)
 
-    return trimesh.util.concatenate(meshes)
+    return _fast_concat(meshes)
 
 
+@_cached_generator
 def generate_nut(
     size: str = "M5",
     nut_type: str = "hex",
     nyloc: bool = False,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -165,42 +168,50 @@ def generate_nut(
         size: 呼び径（M3, M4, M5, M6, M8, M10, M12）
         nut_type: "hex", "square", "flange"
         nyloc: ナイロンインサートを追加
+        chordal_tol: 円の分割数を決める弦高誤差 [mm]
     """
-    dims = METRIC_FASTENERS.get(size.upper(), METRIC_FASTENERS["M5"])
-    nominal_dia = float(size.upper().replace("M", ""))
+    dims = _fastener_dims(size)
+    nominal_dia = dims.nominal_dia
 
-    nut_height = dims["nut_height"]
+    nut_height = dims.nut_height
     if nyloc:
         nut_height *= 1.3
 
     if nut_type == "hex":
-        outline = _hexagon_points((0, 0), dims["nut_flat"])
+        outline = _hexagon_points((0, 0), dims.nut_flat)
     elif nut_type == "square":
-        s = dims["nut_flat"]
+        s = dims.nut_flat
         outline = [(-s/2, -s/2), (s/2, -s/2), (s/2, s/2), (-s/2, s/2)]
     else:  # フランジ
-        outline = _hexagon_points((0, 0), dims["nut_flat"])
+        outline = _hexagon_points((0, 0), dims.nut_flat)
 
-    holes = [_circle_points((0, 0), nominal_dia / 2.0, 32)]
+    bore_segments = _segments_for_radius(nominal_dia / 2.0, chordal_tol)
+    holes = [_circle_points((0, 0), nominal_dia / 2.0, bore_segments)]
+    # 同心の穴が外形の内接円に収まっていれば妥当性判定は不要
+    concentric_fits = nominal_dia < dims.nut_flat
 
-    mesh = _extrude_profile(outline, holes, nut_height)
+    mesh = _extrude_profile(outline, holes, nut_height, trusted=concentric_fits)
 
     if mesh is None:
-        mesh = trimesh.creation.cylinder(
-            radius=dims["nut_flat"] / 2.0,
+        mesh = _cylinder(
+            radius=dims.nut_flat / 2.0,
             height=nut_height,
             sections=6
         )
 
     # 指定時にフランジを追加
     if nut_type == "flange":
-        flange_dia = dims["nut_flat"] * 1.4
+        flange_dia = dims.nut_flat * 1.4
         flange_height = nut_height * 0.2
-        flange_outline = _circle_points((0, 0), flange_dia / 2.0, 64)
-        flange_holes = [_circle_points((0, 0), nominal_dia / 2.0, 32)]
-        flange = _extrude_profile(flange_outline, flange_holes, flange_height)
+        flange_outline = _circle_points(
+            (0, 0), flange_dia / 2.0, _segments_for_radius(flange_dia / 2.0, chordal_tol)
+        )
+        flange_holes = [_circle_points((0, 0), nominal_dia / 2.0, bore_segments)]
+        flange = _extrude_profile(
+            flange_outline, flange_holes, flange_height, trusted=concentric_fits
+        )
         if flange:
-            mesh = trimesh.util.concatenate([mesh, flange])
+            mesh = _fast_concat([mesh, flange])
 
     return mesh
 
@@ -209,44 +220,25 @@ def generate_spacer(
     outer_diameter_mm: float = 10.0,
     inner_diameter_mm: float = 5.0,
     length_mm: float = 5.0,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
     スペーサ/スタンドオフのメッシュを生成する。
     """
-    outline = _circle_points((0, 0), outer_diameter_mm / 2.0, 64)
-    holes = []
-
-    if inner_diameter_mm > 0:
-        holes.append(_circle_points((0, 0), inner_diameter_mm / 2.0, 32))
-
-    mesh = _extrude_profile(outline, holes, length_mm)
-
-    if mesh is None:
-        outer = trimesh.creation.cylinder(
-            radius=outer_diameter_mm / 2.0,
-            height=length_mm,
-            sections=64
-        )
-        if inner_diameter_mm > 0:
-            inner = trimesh.creation.cylinder(
-                radius=inner_diameter_mm / 2.0,
-                height=length_mm * 1.1,
-                sections=32
-            )
-            try:
-                mesh = outer.difference(inner, engine="blender")
-            except Exception:
-                mesh = outer
-        else:
-            mesh = outer
-
-    return mesh
+    # 同軸の穴なので三角形分割を介さず環状体を直接生成
+    outer_radius = outer_diameter_mm / 2.0
+    return _annular_extrude(
+        outer_radius, inner_diameter_mm / 2.0, length_mm,
+        sections=_segments_for_radius(outer_radius, chordal_tol)
+    )
 
 
+@_cached_generator
 def generate_washer(
     size: str = "M5",
     washer_type: str = "flat",
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -255,8 +247,9 @@ def generate_washer(
     引数:
         size: 呼び径（穴径の基準）
         washer_type: "flat", "spring", "lock"
+        chordal_tol: 円の分割数を決める弦高誤差 [mm]
     """
-    nominal_dia = float(size.upper().replace("M", ""))
+    nominal_dia = _fastener_dims(size).nominal_dia
 
     # ワッシャ標準寸法（概略）
     inner_dia = nominal_dia + 0.3  # クリアランス
@@ -268,16 +261,7 @@ def generate_washer(
         thickness = nominal_dia * 0.25
         outer_dia = nominal_dia * 2.0
 
-    outline = _circle_points((0, 0), outer_dia / 2.0, 64)
-    holes = [_circle_points((0, 0), inner_dia / 2.0, 32)]
-
-    mesh = _extrude_profile(outline, holes, thickness)
-
-    if mesh is None:
-        mesh = trimesh.creation.annulus(
-            r_min=inner_dia / 2.0,
-            r_max=outer_dia / 2.0,
-            height=thickness
-        )
-
-    return mesh
+    return _annular_extrude(
+        outer_dia / 2.0, inner_dia / 2.0, thickness,
+        sections=_segments_for_radius(outer_dia / 2.0, chordal_tol)
+    )
@@ -5,23 +5,29 @@
 各関数は部品定義に対応するキーワード引数を受け取る。
 """
 
+from __future__ import annotations
+
 import math
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, Tuple
 
-import trimesh
-from shapely.geometry import Polygon
+import numpy as np
 
+from . import _numeric
+from ._geom import (
+    DEFAULT_CHORDAL_TOL,
+    annular_extrude as _annular_extrude,
+    boolean_difference as _boolean_difference,
+    cached_generator as _cached_generator,
+    circle_points as _circle_points,
+    circle_rings as _circle_rings,
+    cylinder as _cylinder,
+    extrude_profile as _extrude_profile,
+    fast_concat as _fast_concat,
+    segments_for_radius as _segments_for_radius,
+)
 
-def _circle_points(center: Tuple[float, float], radius: float, segments: int = 48) -> List[Tuple[float, float]]:
-    """円周上の点を生成する。"""
-    cx, cy = center
-    pts = []
-    for i in range(segments):
-        theta = 2.0 * math.pi * i / segments
-        x = cx + radius * math.cos(theta)
-        y = cy + radius * math.sin(theta)
-        pts.append((x, y))
-    return pts
+if TYPE_CHECKING:
+    import trimesh
 
 
 def _involute_point(base_radius: float, angle: float) -> Tuple[float, float]:
@@ -36,76 +42,17 @@ def _gear_tooth_profile(
     teeth_count: int,
     pressure_angle_deg: float = 20.0,
     points_per_tooth: int = 8
-) -> List[Tuple[float, float]]:
+) -> np.ndarray:
     """
     歯形プロファイル点を生成する。
 
     メッシュ生成のため簡易インボリュート近似を用いる。
+    数値計算は _numeric（Numba があればJIT版）に委譲する。
     """
-    pitch_diameter = module * teeth_count
-    pitch_radius = pitch_diameter / 2.0
-
-    addendum = module
-    dedendum = 1.25 * module
-
-    outer_radius = pitch_radius + addendum
-    root_radius = max(pitch_radius - dedendum, module)
-    base_radius = pitch_radius * math.cos(math.radians(pressure_angle_deg))
-
-    points = []
-    tooth_angle = 2 * math.pi / teeth_count
-
-    for i in range(teeth_count):
-        base_angle = i * tooth_angle
-
-        # 主要点による簡易歯形プロファイル
-        # 歯元 → 歯面 → 歯先 → 歯面 → 歯元
-        tooth_half = tooth_angle * 0.25
-
-        angles_and_radii = [
-            (-tooth_half * 1.4, root_radius),      # 歯元開始
-            (-tooth_half * 0.8, pitch_radius * 0.95),  # 下側歯面
-            (-tooth_half * 0.3, outer_radius * 0.98),  # 上側歯面
-            (0, outer_radius),                      # 歯先中心
-            (tooth_half * 0.3, outer_radius * 0.98),   # 上側歯面
-            (tooth_half * 0.8, pitch_radius * 0.95),   # 下側歯面
-            (tooth_half * 1.4, root_radius),       # 歯元終端
-        ]
-
-        for offset, radius in angles_and_radii:
-            angle = base_angle + offset
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            points.append((x, y))
-
-    return points
-
-
-def _extrude_profile(
-    outline: List[Tuple[float, float]],
-    holes: List[List[Tuple[float, float]]],
-    height: float,
-    z_offset: float = 0.0
-) -> Optional[trimesh.Trimesh]:
-    """穴付き2Dプロファイルを3Dに押し出す。"""
-    poly = Polygon(outline, holes)
-    if not poly.is_valid:
-        poly = poly.buffer(0)
-    if poly.is_empty:
-        return None
-
-    try:
-        mesh = trimesh.creation.extrude_polygon(
-            poly, height=height,
-            triangulate_kwargs={"engine": "earcut"}
-        )
-        if z_offset:
-            mesh.apply_translation((0.0, 0.0, z_offset))
-        return mesh
-    except Exception:
-        return None
+    return _numeric.tooth_profile(module, teeth_count)
 
 
+@_cached_generator
 def generate_spur_gear(
     module: float = 1.0,
     teeth_count: int = 24,
@@ -114,6 +61,7 @@ def generate_spur_gear(
     bore_diameter_mm: float = 8.0,
     hub_diameter_mm: float = 0,
     hub_length_mm: float = 0,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -127,6 +75,7 @@ def generate_spur_gear(
         bore_diameter_mm: 中心ボア径
         hub_diameter_mm: ハブ径（0=ハブなし）
         hub_length_mm: ハブ長さ
+        chordal_tol: 円の分割数を決める弦高誤差 [mm]
 
     戻り値:
         歯車の trimesh.Trimesh
@@ -140,48 +89,40 @@ def generate_spur_gear(
     holes = []
     if bore_diameter_mm > 0:
         bore_radius = bore_diameter_mm / 2.0
-        holes.append(_circle_points((0, 0), bore_radius, segments=64))
+        holes.append(_circle_points((0, 0), bore_radius, segments=_segments_for_radius(bore_radius, chordal_tol)))
 
     # 歯車本体を押し出し
     main_mesh = _extrude_profile(profile, holes, face_width_mm)
 
     if main_mesh is None:
         # 円柱にフォールバック
-        main_mesh = trimesh.creation.cylinder(
+        main_mesh = _cylinder(
             radius=outer_radius,
             height=face_width_mm,
-            sections=96
+            sections=_segments_for_radius(outer_radius, chordal_tol)
         )
         if bore_diameter_mm > 0:
-            bore_mesh = trimesh.creation.cylinder(
+            bore_mesh = _cylinder(
                 radius=bore_diameter_mm / 2.0,
                 height=face_width_mm * 1.1,
-                sections=64
+                sections=_segments_for_radius(bore_diameter_mm / 2.0, chordal_tol)
             )
-            main_mesh = main_mesh.difference(bore_mesh, engine="blender")
+            main_mesh = _boolean_difference(main_mesh, bore_mesh)
 
     meshes = [main_mesh]
 
     # 指定時はハブを追加
+    # ハブはボア付きの円板なので、三角形分割を介さず環状体を直接生成する
     if hub_diameter_mm > 0 and hub_length_mm > 0:
-        hub_radius = hub_diameter_mm / 2.0
-        hub_holes = []
-        if bore_diameter_mm > 0:
-            hub_holes.append(_circle_points(
-                (0, 0), bore_diameter_mm / 2.0, segments=64
-            ))
-
-        hub_outline = _circle_points((0, 0), hub_radius, segments=64)
-        hub_mesh = _extrude_profile(
-            hub_outline, hub_holes, hub_length_mm,
-            z_offset=face_width_mm
+        hub_mesh = _annular_extrude(
+            hub_diameter_mm / 2.0, bore_diameter_mm / 2.0, hub_length_mm, z_offset=face_width_mm,
+            sections=_segments_for_radius(hub_diameter_mm / 2.0, chordal_tol)
         )
-        if hub_mesh:
-            meshes.append(hub_mesh)
+        meshes.append(hub_mesh)
 
     if len(meshes) == 1:
         return meshes[0]
-    return trimesh.util.concatenate(meshes)
+    return _fast_concat(meshes)
 
 
 def generate_helical_gear(
@@ -192,6 +133,7 @@ def generate_helical_gear(
     face_width_mm: float = 15.0,
     bore_diameter_mm: float = 8.0,
     hand: str = "right",
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -208,6 +150,7 @@ def generate_helical_gear(
         pressure_angle_deg=pressure_angle_deg,
         face_width_mm=face_width_mm,
         bore_diameter_mm=bore_diameter_mm,
+        chordal_tol=chordal_tol,
         **kwargs
     )
 
@@ -219,6 +162,7 @@ def generate_bevel_gear(
     face_width_mm: float = 12.0,
     bore_diameter_mm: float = 10.0,
     shaft_angle_deg: float = 90.0,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
@@ -237,6 +181,11 @@ def generate_bevel_gear(
     top_radius = max(top_radius, bore_diameter_mm / 2.0 + 2.0)
 
     # 円柱セクションでフラスタムを作成
+    # ボアは同軸の直穴なので、各セクションを環状体として直接生成する（ブーリアン不要）
+    bore_radius = bore_diameter_mm / 2.0
+
+    # 各セクションの外周は最大半径の分割数にそろえる
+    outer_segments = _segments_for_radius(outer_radius, chordal_tol)
     sections = 8
     meshes = []
     section_height = face_width_mm / sections
@@ -247,30 +196,12 @@ def generate_bevel_gear(
         r2 = outer_radius - (outer_radius - top_radius) * (t + 1/sections)
         r_avg = (r1 + r2) / 2.0
 
-        section_mesh = trimesh.creation.cylinder(
-            radius=r_avg,
-            height=section_height,
-            sections=64
-        )
-        section_mesh.apply_translation((0, 0, section_height * (i + 0.5)))
-        meshes.append(section_mesh)
+        meshes.append(_annular_extrude(
+            r_avg, bore_radius, section_height,
+            z_offset=section_height * i, sections=outer_segments
+        ))
 
-    mesh = trimesh.util.concatenate(meshes)
-
-    # ボア穴を追加
-    if bore_diameter_mm > 0:
-        bore_mesh = trimesh.creation.cylinder(
-            radius=bore_diameter_mm / 2.0,
-            height=face_width_mm * 1.2,
-            sections=64
-        )
-        bore_mesh.apply_translation((0, 0, face_width_mm / 2.0))
-        try:
-            mesh = mesh.difference(bore_mesh, engine="blender")
-        except Exception:
-            pass  # ブーリアン失敗時はボア無しで返す
-
-    return mesh
+    return _fast_concat(meshes)
 
 
 def generate_rack(
@@ -281,11 +212,14 @@ def generate_rack(
     height_mm: float = 20.0,
     mounting_holes: bool = True,
     hole_diameter_mm: float = 5.0,
+    chordal_tol: float = DEFAULT_CHORDAL_TOL,
     **kwargs
 ) -> trimesh.Trimesh:
     """
     ラックのメッシュを生成する。
     """
+    import trimesh
+
     pitch = math.pi * module
     length = pitch * teeth_count
 
@@ -296,35 +230,28 @@ def generate_rack(
 
     # 基本プロファイル（ラック側面）
     base_height = height_mm - tooth_height
+    tooth_top = base_height + tooth_height
 
     # 歯形プロファイル点を生成（2D断面）
-    profile_points = []
-
-    # 左下
-    profile_points.append((0, 0))
-    # 右下
-    profile_points.append((length, 0))
-    # 右上（歯の基部）
-    profile_points.append((length, base_height))
-
-    # 歯を追加
-    pressure_angle_rad = math.radians(pressure_angle_deg)
+    # 歯は右から左へ並べ、外形が自己交差しない反時計回りの多角形にする
     tooth_half_width = pitch / 4.0
-
-    for i in range(teeth_count):
-        x_center = pitch * (i + 0.5)
-
-        # 歯底（歯元）
-        profile_points.append((x_center - tooth_half_width * 1.3, base_height))
-        # 立ち上がり歯面
-        profile_points.append((x_center - tooth_half_width * 0.5, base_height + tooth_height))
-        # 歯先
-        profile_points.append((x_center + tooth_half_width * 0.5, base_height + tooth_height))
-        # 下り歯面
-        profile_points.append((x_center + tooth_half_width * 1.3, base_height))
-
-    # プロファイルを閉じる
-    profile_points.append((0, base_height))
+    x_centers = pitch * (np.arange(teeth_count)[::-1] + 0.5)
+
+    teeth = np.empty((teeth_count, 4, 2))
+    teeth[:, 0, 0] = x_centers + tooth_half_width * 1.3   # 歯底（右）
+    teeth[:, 0, 1] = base_height
+    teeth[:, 1, 0] = x_centers + tooth_half_width * 0.5   # 下り歯面
+    teeth[:, 1, 1] = tooth_top
+    teeth[:, 2, 0] = x_centers - tooth_half_width * 0.5   # 歯先
+    teeth[:, 2, 1] = tooth_top
+    teeth[:, 3, 0] = x_centers - tooth_half_width * 1.3   # 歯底（左）
+    teeth[:, 3, 1] = base_height
+
+    profile_points = np.concatenate([
+        [(0.0, 0.0), (length, 0.0), (length, base_height)],  # 左下 → 右下 → 右上（歯の基部）
+        teeth.reshape(-1, 2),
+        [(0.0, base_height)],                                 # プロファイルを閉じる
+    ])
 
     # 押し出し
     holes = []
@@ -333,11 +260,13 @@ def generate_rack(
     if mounting_holes:
         hole_radius = hole_diameter_mm / 2.0
         hole_y = base_height / 2.0
-        hole_spacing = length / (teeth_count // 5 + 1)
+        hole_count = teeth_count // 5
+        hole_spacing = length / (hole_count + 1)
 
-        for i in range(1, teeth_count // 5 + 1):
-            hole_x = hole_spacing * i
-            holes.append(_circle_points((hole_x, hole_y), hole_radius, segments=32))
+        hole_centers = np.zeros((hole_count, 2))
+        hole_centers[:, 0] = hole_spacing * np.arange(1, hole_count + 1)
+        hole_centers[:, 1] = hole_y
+        holes = _circle_rings(hole_centers, hole_radius, _segments_for_radius(hole_radius, chordal_tol))
 
     mesh = _extrude_profile(profile_points, holes, face_width_mm)
 
@@ -2,23 +2,52 @@
 構造部品のメッシュ生成関数。
 """
 
+from __future__ import annotations
+
+import functools
 import math
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+from ._geom import (
+    circle_points as _circle_points,
+    extrude_profile as _extrude_profile,
+    fast_concat as _fast_concat,
+    translation_matrix as _translation,
+)
+
+if TYPE_CHECKING:
+    import trimesh
+
+
+# _rounded_rect_outline のキャッシュキーに使う丸め桁数
+_OUTLINE_KEY_DECIMALS = 6
 
-import trimesh
-from shapely.geometry import Polygon
+# 分割数ごとの単位四分円（0〜90度、端点を含む）
+_UNIT_CORNERS: Dict[int, np.ndarray] = {}
 
 
-def _circle_points(center: Tuple[float, float], radius: float, segments: int = 48) -> List[Tuple[float, float]]:
-    """円周上の点を生成する。"""
-    cx, cy = center
-    pts = []
-    for i in range(segments):
-        theta = 2.0 * math.pi * i / segments
-        x = cx + radius * math.cos(theta)
-        y = cy + radius * math.sin(theta)
-        pts.append((x, y))
-    return pts
+def _unit_corner(segments_per_corner: int) -> np.ndarray:
+    """単位四分円の点列を返す（三角関数は分割数ごとに1回だけ計算）。"""
+    unit = _UNIT_CORNERS.get(segments_per_corner)
+    if unit is None:
+        t = np.linspace(0.0, math.pi / 2, segments_per_corner + 1)
+        unit = np.stack([np.cos(t), np.sin(t)], axis=1)
+        _UNIT_CORNERS[segments_per_corner] = unit
+    return unit
+
+
+# 既定の分割数（8）の四分円は import 時に用意しておく
+_unit_corner(8)
+
+# 右上・左上・左下・右下の隅に対応する 0/90/180/270 度回転（行ベクトルに右から掛ける）
+_CORNER_ROTATIONS = np.array([
+    [[1.0, 0.0], [0.0, 1.0]],
+    [[0.0, 1.0], [-1.0, 0.0]],
+    [[-1.0, 0.0], [0.0, -1.0]],
+    [[0.0, -1.0], [1.0, 0.0]],
+])
 
 
 def _rounded_rect_outline(
@@ -26,51 +55,40 @@ def _rounded_rect_outline(
     height: float,
     corner_radius: float,
     segments_per_corner: int = 8
-) -> List[Tuple[float, float]]:
-    """角丸矩形の輪郭を生成する。"""
-    points = []
-    r = min(corner_radius, width / 2, height / 2)
-
-    corners = [
-        (width - r, height - r, 0),      # 右上
-        (r, height - r, 90),             # 左上
-        (r, r, 180),                     # 左下
-        (width - r, r, 270),             # 右下
-    ]
-
-    for cx, cy, start_angle in corners:
-        for i in range(segments_per_corner + 1):
-            angle = math.radians(start_angle + 90 * i / segments_per_corner)
-            x = cx + r * math.cos(angle)
-            y = cy + r * math.sin(angle)
-            points.append((x, y))
+) -> np.ndarray:
+    """
+    角丸矩形の輪郭を (N, 2) 配列で生成する。
 
-    return points
+    同じ寸法の輪郭は繰り返し使われるためキャッシュし、読み取り専用の配列を返す。
+    """
+    return _rounded_rect_cached(
+        round(float(width), _OUTLINE_KEY_DECIMALS),
+        round(float(height), _OUTLINE_KEY_DECIMALS),
+        round(float(corner_radius), _OUTLINE_KEY_DECIMALS),
+        int(segments_per_corner),
+    )
 
 
-def _extrude_profile(
-    outline: List[Tuple[float, float]],
-    holes: List[List[Tuple[float, float]]],
+@functools.lru_cache(maxsize=256)
+def _rounded_rect_cached(
+    width: float,
     height: float,
-    z_offset: float = 0.0
-) -> Optional[trimesh.Trimesh]:
-    """穴付き2Dプロファイルを3Dに押し出す。"""
-    poly = Polygon(outline, holes)
-    if not poly.is_valid:
-        poly = poly.buffer(0)
-    if poly.is_empty:
-        return None
-
-    try:
-        mesh = trimesh.creation.extrude_polygon(
-            poly, height=height,
-            triangulate_kwargs={"engine": "earcut"}
-        )
-        if z_offset:
-            mesh.apply_translation((0.0, 0.0, z_offset))
-        return mesh
-    except Exception:
-        return None
+    corner_radius: float,
+    segments_per_corner: int
+) -> np.ndarray:
+    r = min(corner_radius, width / 2, height / 2)
+    arc = r * _unit_corner(segments_per_corner)
+    centers = np.array([
+        (width - r, height - r),    # 右上（0度〜）
+        (r, height - r),            # 左上（90度〜）
+        (r, r),                     # 左下（180度〜）
+        (width - r, r),             # 右下（270度〜）
+    ])
+
+    # 四分円を4隅の回転行列へ一括で掛けて (4, segments+1, 2) を作り、平坦化する
+    outline = (arc @ _CORNER_ROTATIONS + centers[:, None, :]).reshape(-1, 2)
+    outline.setflags(write=False)
+    return outline
 
 
 def generate_bracket(
@@ -85,7 +103,10 @@ def generate_bracket(
     """
     L字ブラケットのメッシュを生成する。
     """
+    import trimesh
+
     meshes = []
+    transforms = []
 
     # 水平フランジ
     h_outline = _rounded_rect_outline(width_mm, depth_mm, corner_radius_mm)
@@ -100,6 +121,7 @@ def generate_bracket(
     h_mesh = _extrude_profile(h_outline, h_holes, thickness_mm)
     if h_mesh:
         meshes.append(h_mesh)
+        transforms.append(None)
 
     # 垂直フランジ
     v_outline = _rounded_rect_outline(width_mm, height_mm, corner_radius_mm)
@@ -109,18 +131,18 @@ def generate_bracket(
 
     v_mesh = _extrude_profile(v_outline, v_holes, thickness_mm)
     if v_mesh:
-        # 垂直に回転して配置
-        v_mesh.apply_transform(trimesh.transformations.rotation_matrix(
-            math.radians(90), [1, 0, 0]
-        ))
-        v_mesh.apply_translation((0, thickness_mm, thickness_mm))
+        # 垂直に回転して配置（回転と平行移動を1つの行列にまとめ、連結時に適用）
         meshes.append(v_mesh)
+        transforms.append(
+            _translation((0, thickness_mm, thickness_mm))
+            @ trimesh.transformations.rotation_matrix(math.radians(90), [1, 0, 0])
+        )
 
     if not meshes:
         # 簡易L字形状にフォールバック
         return trimesh.creation.box(extents=(width_mm, depth_mm, thickness_mm))
 
-    return trimesh.util.concatenate(meshes)
+    return _fast_concat(meshes, transforms)
 
 
 def generate_plate(
@@ -136,6 +158,8 @@ def generate_plate(
     """
     穴付き矩形プレートのメッシュを生成する。
     """
+    import trimesh
+
     outline = _rounded_rect_outline(width_mm, height_mm, corner_radius_mm)
     holes = []
 
@@ -170,8 +194,8 @@ def generate_plate(
 
     mesh = _extrude_profile(outline, holes, thickness_mm)
     if mesh is None:
-        mesh = trimesh.creation.box(extents=(width_mm, height_mm, thickness_mm))
-        mesh.apply_translation((width_mm / 2, height_mm / 2, thickness_mm / 2))
+        # 配置済みの範囲で直接作る（平行移動による頂点の再計算を省く）
+        mesh = trimesh.creation.box(bounds=((0, 0, 0), (width_mm, height_mm, thickness_mm)))
 
     return mesh
 
@@ -189,6 +213,8 @@ def generate_frame(
     """
     矩形フレーム（中空矩形）を生成する。
     """
+    import trimesh
+
     outer_outline = _rounded_rect_outline(outer_width_mm, outer_height_mm, corner_radius_mm)
 
     inner_width = outer_width_mm - 2 * wall_thickness_mm
@@ -201,7 +227,7 @@ def generate_frame(
     if inner_width > 0 and inner_height > 0:
         inner_outline = _rounded_rect_outline(inner_width, inner_height, inner_radius)
         # 内側輪郭を中央へオフセット
-        inner_outline = [(x + wall_thickness_mm, y + wall_thickness_mm) for x, y in inner_outline]
+        inner_outline = inner_outline + wall_thickness_mm
         holes.append(inner_outline)
 
     # 取付穴
@@ -219,7 +245,6 @@ def generate_frame(
 
     mesh = _extrude_profile(outer_outline, holes, depth_mm)
     if mesh is None:
-        mesh = trimesh.creation.box(extents=(outer_width_mm, outer_height_mm, depth_mm))
-        mesh.apply_translation((outer_width_mm / 2, outer_height_mm / 2, depth_mm / 2))
+        mesh = trimesh.creation.box(bounds=((0, 0, 0), (outer_width_mm, outer_height_mm, depth_mm)))
 
     return mesh
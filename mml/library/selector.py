@@ -4,12 +4,11 @@
 OpenAIでユーザー意図を解析し、カタログから適切な部品を選択する。
 """
 
+import functools
 import json
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
-from openai import OpenAI
-
 from .catalog import get_catalog, PartDefinition
 
 
@@ -43,9 +42,15 @@ class PartSelector:
     """
 
     def __init__(self, api_key: str, model: str = "gpt-4o"):
+        from openai import OpenAI  # AI選択を使う場合のみ読み込む
+
         self.client = OpenAI(api_key=api_key)
         self.model = model
         self.catalog = get_catalog()
+        # システムプロンプトはカタログが同じ間は不変なので1回だけ作る。
+        # 呼び出し間でバイト単位で同一に保ち、先頭一致によるプロンプトキャッシュを効かせる
+        # （時刻など可変の内容は含めず、意図・ビジョン情報はユーザープロンプト側に置く）
+        self._system_prompt = self._build_system_prompt()
 
     def select(
         self,
@@ -64,47 +69,14 @@ class PartSelector:
         戻り値:
             選択部品とパラメータを含むSelectionResult
         """
-        # カタログ文脈付きプロンプトを構築
-        catalog_summary = self._build_catalog_prompt()
+        # システムプロンプトは固定、呼び出しごとに変わるのはユーザープロンプトのみ
         user_prompt = self._build_user_prompt(intent, vision_data)
 
-        system_prompt = f"""You are a mechanical engineering assistant that selects appropriate parts from a parts library.
-
-{catalog_summary}
-
-Based on the user's intent, select the appropriate parts and infer reasonable parameters.
-Consider:
-1. What the user wants to build/achieve
-2. Which parts are needed
-3. Appropriate parameters for each part
-4. Quantities needed
-
-Return JSON with this exact structure:
-{{
-  "parts": [
-    {{
-      "part_id": "spur_gear",
-      "parameters": {{"module": 1.5, "teeth_count": 24}},
-      "quantity": 2,
-      "confidence": 0.85,
-      "reasoning": "Selected for power transmission"
-    }}
-  ],
-  "assembly_notes": "Description of how parts fit together"
-}}
-
-Rules:
-- Only select parts that exist in the catalog
-- Provide reasonable default parameters if not specified
-- Set confidence between 0 and 1
-- Keep quantity reasonable (usually 1-4)
-"""
-
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self._system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_format={"type": "json_object"},
@@ -122,28 +94,9 @@ Rules:
                 raw_response={"error": str(e)}
             )
 
-    def _build_catalog_prompt(self) -> str:
-        """AI向けのカタログ説明を作成する。"""
-        lines = ["## Available Parts Library\n"]
-
-        for category in sorted(self.catalog.categories()):
-            lines.append(f"\n### {category.title()}")
-
-            for part in self.catalog.by_category(category):
-                name = part.get_name("ja")
-                lines.append(f"\n**{part.id}** ({name})")
-
-                if part.ai_context:
-                    lines.append(f"  使用場面: {part.ai_context}")
-
-                lines.append("  パラメータ:")
-                for param_name, param_def in list(part.parameters.items())[:5]:
-                    desc = param_def.get("description", {}).get("ja", param_name)
-                    default = param_def.get("default")
-                    unit = param_def.get("unit", "")
-                    lines.append(f"    - {param_name}: {desc} (default: {default}{unit})")
-
-        return "\n".join(lines)
+    def _build_system_prompt(self) -> str:
+        """カタログ説明を含む固定のシステムプロンプトを作成する。"""
+        return _system_prompt_for(self.catalog.prompt_text)
 
     def _build_user_prompt(
         self,
@@ -217,6 +170,42 @@ Rules:
         )
 
 
+@functools.lru_cache(maxsize=4)
+def _system_prompt_for(catalog_summary: str) -> str:
+    """カタログ説明からシステムプロンプトを作成する（カタログが同じ間は作り直さない）。"""
+    return f"""You are a mechanical engineering assistant that selects appropriate parts from a parts library.
+
+{catalog_summary}
+
+Based on the user's intent, select the appropriate parts and infer reasonable parameters.
+Consider:
+1. What the user wants to build/achieve
+2. Which parts are needed
+3. Appropriate parameters for each part
+4. Quantities needed
+
+Return JSON with this exact structure:
+{{
+  "parts": [
+    {{
+      "part_id": "spur_gear",
+      "parameters": {{"module": 1.5, "teeth_count": 24}},
+      "quantity": 2,
+      "confidence": 0.85,
+      "reasoning": "Selected for power transmission"
+    }}
+  ],
+  "assembly_notes": "Description of how parts fit together"
+}}
+
+Rules:
+- Only select parts that exist in the catalog
+- Provide reasonable default parameters if not specified
+- Set confidence between 0 and 1
+- Keep quantity reasonable (usually 1-4)
+"""
+
+
 def select_parts_for_intent(
     intent: Dict[str, Any],
     api_key: str,
@@ -255,6 +244,7 @@ def heuristic_part_selection(
     """
     catalog = get_catalog()
     parts = []
+    seen_ids = set()  # 追加済みの part_id
     # ビジョンのヒントを確認
     if vision_data and vision_data.get("part_hint"):
         hint = vision_data["part_hint"].lower()
@@ -267,6 +257,7 @@ def heuristic_part_selection(
                 "reasoning": "Inferred from vision analysis",
                 "quantity": 1
             })
+            seen_ids.add(matches[0].id)
     # 機構タイプを確認
     mechanism = (intent.get("mechanism_type") or "").lower()
 
@@ -283,7 +274,7 @@ def heuristic_part_selection(
             except (ValueError, TypeError):
                 pass
 
-        if not any(p["part_id"] == "spur_gear" for p in parts):
+        if "spur_gear" not in seen_ids:
             parts.append({
                 "part_id": "spur_gear",
                 "parameters": gear_params,
@@ -291,9 +282,10 @@ def heuristic_part_selection(
                 "reasoning": "Mechanism type indicates gear",
                 "quantity": 2
             })
+            seen_ids.add("spur_gear")
 
     if "shaft" in mechanism or "軸" in mechanism:
-        if not any(p["part_id"] == "shaft" for p in parts):
+        if "shaft" not in seen_ids:
             parts.append({
                 "part_id": "shaft",
                 "parameters": {},
@@ -301,9 +293,10 @@ def heuristic_part_selection(
                 "reasoning": "Mechanism requires shaft",
                 "quantity": 1
             })
+            seen_ids.add("shaft")
 
     if "bearing" in mechanism or "軸受" in mechanism:
-        if not any(p["part_id"] == "bearing" for p in parts):
+        if "bearing" not in seen_ids:
             parts.append({
                 "part_id": "bearing",
                 "parameters": {},
@@ -311,6 +304,7 @@ def heuristic_part_selection(
                 "reasoning": "Mechanism requires bearing",
                 "quantity": 2
             })
+            seen_ids.add("bearing")
     # 接続方法を確認
     connections = (intent.get("connections") or "").lower()
     if "bolt" in connections or "ボルト" in connections:
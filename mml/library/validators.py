@@ -2,10 +2,40 @@
 部品定義のパラメータ検証ユーティリティ。
 """
 
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 from .catalog import PartDefinition
 
 
+@dataclass
+class ValidationIssue:
+    """
+    パラメータ検証で見つかった問題。
+
+    メッセージは表示する呼び出し側が str() したときに整形する。
+    kind は "type" / "int" / "min" / "max" / "enum" / "constraint" のいずれか。
+    "constraint" の場合、limit に制約の失敗時メッセージを持つ。
+    """
+
+    kind: str
+    param: str
+    value: Any = None
+    limit: Any = None
+
+    def __str__(self) -> str:
+        if self.kind == "type":
+            return f"{self.param}: expected int, got {type(self.value).__name__}"
+        if self.kind == "int":
+            return f"{self.param}: expected int, got float {self.value}"
+        if self.kind == "min":
+            return f"{self.param}: value {self.value} below minimum {self.limit}"
+        if self.kind == "max":
+            return f"{self.param}: value {self.value} above maximum {self.limit}"
+        if self.kind == "enum":
+            return f"{self.param}: value {self.value} not in allowed values {self.limit}"
+        return str(self.limit)
+
+
 def fill_defaults(
     definition: PartDefinition, params: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -30,7 +60,7 @@ def fill_defaults(
 
 def validate_parameters(
     definition: PartDefinition, params: Dict[str, Any]
-) -> List[str]:
+) -> List[ValidationIssue]:
     """
     パラメータを部品定義の制約に対して検証する。
 
@@ -39,7 +69,7 @@ def validate_parameters(
         params: 検証対象のパラメータ
 
     戻り値:
-        警告メッセージのリスト（問題なければ空）
+        検出した問題のリスト（問題なければ空、str() で警告メッセージになる）
     """
     warnings = []
 
@@ -53,34 +83,31 @@ def validate_parameters(
         # 型の検証
         if param_type == "int":
             if not isinstance(value, (int, float)):
-                warnings.append(f"{param_name}: expected int, got {type(value).__name__}")
+                warnings.append(ValidationIssue("type", param_name, value))
             elif isinstance(value, float) and value != int(value):
-                warnings.append(f"{param_name}: expected int, got float {value}")
+                warnings.append(ValidationIssue("int", param_name, value))
 
         # 範囲の検証
         min_val = param_def.get("min")
         max_val = param_def.get("max")
         if min_val is not None and value < min_val:
-            warnings.append(f"{param_name}: value {value} below minimum {min_val}")
+            warnings.append(ValidationIssue("min", param_name, value, min_val))
         if max_val is not None and value > max_val:
-            warnings.append(f"{param_name}: value {value} above maximum {max_val}")
+            warnings.append(ValidationIssue("max", param_name, value, max_val))
 
         # 列挙値の検証
         enum_values = param_def.get("enum_values")
         if enum_values is not None and value not in enum_values:
-            warnings.append(f"{param_name}: value {value} not in allowed values {enum_values}")
-
-    # 式による制約
-    for constraint in definition.constraints:
-        if constraint.get("kind") == "expression":
-            expr = constraint.get("expression", "")
-            try:
-                # params をローカルとして簡易式評価
-                if not eval(expr, {"__builtins__": {}}, params):
-                    msg = constraint.get("message", f"Constraint failed: {expr}")
-                    warnings.append(msg)
-            except Exception:
-                pass  # 不正な式は無視
+            warnings.append(ValidationIssue("enum", param_name, value, enum_values))
+
+    # 式による制約（カタログ読み込み時にコンパイル済み）
+    for code, message in definition.compiled_constraints:
+        try:
+            # params をローカルとして簡易式評価
+            if not eval(code, {"__builtins__": {}}, params):
+                warnings.append(ValidationIssue("constraint", "", limit=message))
+        except Exception:
+            pass  # 評価できない式は無視
 
     return warnings
 
@@ -141,10 +168,9 @@ def apply_scale(
         return params
 
     scaled = params.copy()
-    for param_name, param_def in definition.parameters.items():
-        unit = param_def.get("unit", "")
-        if unit in ("mm", "m", "cm", "inch"):
-            if param_name in scaled and scaled[param_name] is not None:
-                scaled[param_name] = scaled[param_name] * scale
+    for param_name in definition.dim_params:
+        value = scaled.get(param_name)
+        if value is not None:
+            scaled[param_name] = value * scale
 
     return scaled
@@ -5,11 +5,14 @@ MML処理のパイプラインモジュール。
 """
 
 import os
-from typing import Dict, Any, Optional
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional
 
 from .ai_vision import run_ai_vision
 from .draw import draw_dxf, draw_png
-from .stl import write_stl
+from .stl import write_binary_stl, write_stl
 from .emit import emit_mml
 from .utils import ensure_dir, write_json
 from .vision import normalize_vision, run_vision
@@ -33,15 +36,21 @@ def run_pipeline(image_path, out_dir, params=None, api_key=None, model=None):
     mml, report = emit_mml(vision, params, os.path.basename(image_path))
     mml_path = os.path.join(out_dir, "mml.json")
     report_path = os.path.join(out_dir, "report.json")
-    write_json(mml_path, mml)
-    write_json(report_path, report)
-
     dxf_path = os.path.join(out_dir, "drawing.dxf")
-    draw_dxf(mml, dxf_path)
     png_path = os.path.join(out_dir, "drawing.png")
-    draw_png(mml, png_path)
     stl_path = os.path.join(out_dir, "model.stl")
-    write_stl(mml, stl_path)
+
+    # 各出力は mml を読むだけで互いに独立しているため並行して書き出す
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(write_json, mml_path, mml),
+            executor.submit(write_json, report_path, report),
+            executor.submit(draw_dxf, mml, dxf_path),
+            executor.submit(draw_png, mml, png_path),
+            executor.submit(write_stl, mml, stl_path),
+        ]
+        for future in futures:
+            future.result()  # 例外があればここで送出する
 
     return {
         "vision": vision_path,
@@ -53,6 +62,31 @@ def run_pipeline(image_path, out_dir, params=None, api_key=None, model=None):
     }
 
 
+def _generate_and_export(
+    part_id: str,
+    part_params: Dict[str, Any],
+    quantity: int,
+    out_dir: str
+) -> List[str]:
+    """部品メッシュを生成して個数分のSTLを書き出す。"""
+    from .library import generate_part_mesh
+
+    result = generate_part_mesh(part_id, part_params)
+
+    stl_paths = []
+    for q in range(quantity):
+        suffix = f"_{q+1}" if quantity > 1 else ""
+        stl_name = f"{part_id}{suffix}.stl"
+        stl_path = os.path.join(out_dir, stl_name)
+        if stl_paths:
+            # 同一形状なので2個目以降は書き出したファイルを複製する
+            shutil.copyfile(stl_paths[0], stl_path)
+        else:
+            write_binary_stl(result.mesh, stl_path)
+        stl_paths.append(stl_path)
+    return stl_paths
+
+
 def run_library_pipeline(
     image_path: str,
     out_dir: str,
@@ -76,7 +110,6 @@ def run_library_pipeline(
         出力ファイルパスと選択結果の辞書
     """
     from .intent import infer_parts_from_intent
-    from .library import generate_part_mesh
 
     params = params or {}
     ensure_dir(out_dir)
@@ -105,31 +138,20 @@ def run_library_pipeline(
     # 選択結果を保存
     selection_path = os.path.join(out_dir, "parts_selection.json")
     write_json(selection_path, {
-        "selected_parts": selected_parts,
+        "selected_parts": [asdict(p) for p in selected_parts],
         "catalog_version": "1.0"
     })
 
     # 手順4: 選択部品のメッシュ生成
+    # 1部品あたり数ミリ秒で済み、同一プロセス内ならメッシュキャッシュも効くため順に処理する
     stl_paths = []
     generation_errors = []
 
-    for part_info in selected_parts:
-        part_id = part_info["part_id"]
-        part_params = part_info.get("parameters", {})
-        quantity = part_info.get("quantity", 1)
-
+    for p in selected_parts:
         try:
-            result = generate_part_mesh(part_id, part_params)
-
-            for q in range(quantity):
-                suffix = f"_{q+1}" if quantity > 1 else ""
-                stl_name = f"{part_id}{suffix}.stl"
-                stl_path = os.path.join(out_dir, stl_name)
-                result.mesh.export(stl_path)
-                stl_paths.append(stl_path)
-
+            stl_paths.extend(_generate_and_export(p.part_id, p.parameters, p.quantity, out_dir))
         except Exception as e:
-            generation_errors.append(f"{part_id}: {str(e)}")
+            generation_errors.append(f"{p.part_id}: {str(e)}")
 
     if generation_errors:
         report["generation_errors"] = generation_errors
@@ -1,58 +1,104 @@
+import functools
 import math
 
-from shapely.geometry import Polygon
+import numpy as np
 import trimesh
 
+from .library.generators._geom import (
+    annular_extrude,
+    extrude_profile,
+    extrude_triangulation,
+    instance_mesh,
+    open_ring,
+    triangulate_rings,
+)
+
+
+def _cos_sin(theta):
+    # exp(iθ) で cos と sin を1回の ufunc でまとめて求め、(N, 2) の実数配列として見る
+    return np.exp(1j * theta).view(np.float64).reshape(-1, 2)
+
+
+@functools.lru_cache(maxsize=32)
+def _unit_circle(segments):
+    # 分割数ごとの単位円（cos, sin）の表。呼び出し側は拡大・平行移動だけ行う
+    if segments % 4 == 0:
+        # 4の倍数なら第1象限だけ計算し、残りは成分の入れ替えと符号反転で埋める
+        q = _cos_sin(np.linspace(0.0, 0.5 * math.pi, segments // 4, endpoint=False))
+        c, s = q[:, 0], q[:, 1]
+        unit = np.concatenate((
+            q,
+            np.column_stack((-s, c)),
+            np.column_stack((-c, -s)),
+            np.column_stack((s, -c)),
+        ))
+    else:
+        unit = _cos_sin(np.linspace(0.0, math.tau, segments, endpoint=False))
+    unit.setflags(write=False)
+    return unit
+
+
+@functools.lru_cache(maxsize=32)
+def _unit_sweep(sweep_deg, segments):
+    # 0度から sweep_deg までの単位円弧（開始角の異なる円弧で共有する）
+    unit = _cos_sin(np.radians(np.linspace(0.0, sweep_deg, segments + 1)))
+    unit.setflags(write=False)
+    return unit
+
+
+@functools.lru_cache(maxsize=32)
+def _unit_arc(start_deg, end_deg, segments):
+    # 加法定理で共有の円弧を開始角だけ回転する（三角関数は開始角の2回のみ）
+    sweep = _unit_sweep(end_deg - start_deg, segments)
+    start = math.radians(start_deg)
+    dc, ds = math.cos(start), math.sin(start)
+    unit = np.column_stack((
+        sweep[:, 0] * dc - sweep[:, 1] * ds,
+        sweep[:, 1] * dc + sweep[:, 0] * ds,
+    ))
+    unit.setflags(write=False)
+    return unit
+
+
+def _place_unit(unit, center, radius):
+    # 単位表を拡大した新しい配列に中心座標を列ごとに加える（一時配列を作らない）
+    out = np.multiply(unit, radius)
+    out[:, 0] += center[0]
+    out[:, 1] += center[1]
+    return out
+
 
 def _circle_points(center, radius, segments=48):
-    cx, cy = center
-    pts = []
-    for i in range(segments):
-        theta = 2.0 * math.pi * i / segments
-        x = cx + radius * math.cos(theta)
-        y = cy + radius * math.sin(theta)
-        pts.append((x, y))
-    return pts
+    return _place_unit(_unit_circle(int(segments)), center, radius)
 
 
 def _gear_outline(outer_diameter, teeth_count):
     teeth = max(8, int(teeth_count))
     outer_r = float(outer_diameter) / 2.0
     root_r = outer_r * 0.85
-    points = []
     total = teeth * 2
-    for i in range(total):
-        theta = 2.0 * math.pi * i / total
-        r = outer_r if i % 2 == 0 else root_r
-        points.append((r * math.cos(theta), r * math.sin(theta)))
-    return points
+    r = np.where(np.arange(total) % 2 == 0, outer_r, root_r)
+    return r[:, None] * _unit_circle(total)
 
 
 def _arc_points(center, radius, start_deg, end_deg, segments=12):
-    cx, cy = center
-    pts = []
-    for i in range(segments + 1):
-        t = i / float(segments)
-        deg = start_deg + (end_deg - start_deg) * t
-        theta = math.radians(deg)
-        x = cx + radius * math.cos(theta)
-        y = cy + radius * math.sin(theta)
-        pts.append((x, y))
-    return pts
-
-
-def _rounded_rect_outline(width, height, radius, segments=8):
+    return _place_unit(_unit_arc(start_deg, end_deg, int(segments)), center, radius)
+
+
+def _rounded_rect_outline(width, height, radius, segments=8, chord_tol_mm=0.5):
     w = float(width)
     h = float(height)
     r = min(float(radius), w / 2.0, h / 2.0)
     if r <= 0:
         return [(0.0, 0.0), (w, 0.0), (w, h), (0.0, h)]
-    pts = []
-    pts.extend(_arc_points((w - r, r), r, -90, 0, segments))
-    pts.extend(_arc_points((w - r, h - r), r, 0, 90, segments))
-    pts.extend(_arc_points((r, h - r), r, 90, 180, segments))
-    pts.extend(_arc_points((r, r), r, 180, 270, segments))
-    return pts
+    # 小さな丸みは弦長が chord_tol_mm 程度になる分割数まで減らす（segments は上限）
+    segments = min(int(segments), max(2, math.ceil(math.pi * r / (2.0 * chord_tol_mm))))
+    return np.vstack((
+        _arc_points((w - r, r), r, -90, 0, segments),
+        _arc_points((w - r, h - r), r, 0, 90, segments),
+        _arc_points((r, h - r), r, 90, 180, segments),
+        _arc_points((r, r), r, 180, 270, segments),
+    ))
 
 
 def _thickness_from_mml(mml):
@@ -101,16 +147,45 @@ def _arm_dims(mml, scale):
     }
 
 
-def _extrude_profile(outline, holes, height, z_offset=0.0):
-    poly = Polygon(outline, holes)
-    if not poly.is_valid:
-        poly = poly.buffer(0)
-    if poly.is_empty:
+def _ring_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def _triangle_areas(vertices, faces):
+    tri = vertices[faces]
+    d1 = tri[:, 1] - tri[:, 0]
+    d2 = tri[:, 2] - tri[:, 0]
+    return 0.5 * np.abs(d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0])
+
+
+def _extrude_profile(outline, holes, height, z_offset=0.0, trust_input=True):
+    # 分割と押し出しは部品ライブラリの _geom と共通の処理を使う
+    if trust_input:
+        # 生成した輪郭は妥当な前提で GEOS を通さず分割し、面積の一致だけ確かめる
+        rings = [open_ring(outline)] + [open_ring(h) for h in holes]
+        triangulation = triangulate_rings(rings)
+        if triangulation is not None:
+            expected = _ring_area(rings[0]) - sum(_ring_area(r) for r in rings[1:])
+            actual = _triangle_areas(*triangulation).sum()
+            if abs(actual - expected) <= 1e-6 * max(expected, 1.0):
+                return extrude_triangulation(*triangulation, height, z_offset=z_offset)
+    # 利用者の輪郭など妥当と限らない形状は Shapely で判定し、不正なものだけ修復する
+    return extrude_profile(outline, holes, height, z_offset=z_offset)
+
+
+def _ring_bosses(centers, outer_r, inner_r, height, z_offset, segments, inner_segments=None):
+    # 同形状のリングは部品ライブラリと同じ環状体を1つ作り、各中心へずらして1つのメッシュにまとめる
+    ring = annular_extrude(
+        float(outer_r), float(inner_r), height, z_offset=z_offset,
+        sections=int(segments), inner_sections=int(inner_segments or segments),
+    )
+    if ring is None:
         return None
-    mesh = trimesh.creation.extrude_polygon(poly, height=height, triangulate_kwargs={"engine": "earcut"})
-    if z_offset:
-        mesh.apply_translation((0.0, 0.0, z_offset))
-    return mesh
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    transforms = np.repeat(np.eye(4)[None, :, :], len(centers), axis=0)
+    transforms[:, :2, 3] = centers
+    return instance_mesh(ring, transforms)
 
 
 def _link_profile():
@@ -151,10 +226,48 @@ def _base_profile():
     return outline, holes, hole_r
 
 
+# 部品名に含まれる語と形状の種類の対応（並び順が優先順位）
+_PRIMITIVE_PATTERNS = (
+    ("link", ("link", "arm")),
+    ("joint", ("joint",)),
+    ("base", ("base",)),
+    ("end_effector", ("end_effector", "gripper")),
+    ("shaft", ("shaft",)),
+    ("motor", ("rotor", "stator", "motor", "actuator")),
+    ("mount", ("mount",)),
+    ("bearing", ("bearing",)),
+    ("spacer", ("spacer",)),
+    ("bracket", ("bracket",)),
+    ("gear", ("gear",)),
+)
+
+# 部品名 -> 種類（BOM では同じ名前が繰り返し現れるため、判定は名前ごとに1回）
+_PRIMITIVE_KINDS = {}
+
+
+def _primitive_kind(name):
+    kind = _PRIMITIVE_KINDS.get(name)
+    if kind is None:
+        kind = next(
+            (k for k, words in _PRIMITIVE_PATTERNS if any(w in name for w in words)),
+            "other",
+        )
+        if len(_PRIMITIVE_KINDS) < 1024:
+            _PRIMITIVE_KINDS[name] = kind
+    return kind
+
+
 def _primitive_for_part(part_name, thickness, mml=None):
-    name = (part_name or "").lower()
+    kind = _primitive_kind((part_name or "").lower())
     scale = _scale_from_mml(mml)
     dims = _arm_dims(mml, scale)
+    # 形状は種類・厚み・寸法だけで決まるため、同じ組み合わせは生成済みメッシュを複製して返す
+    return _primitive_cached(kind, float(thickness), scale, tuple(dims.items())).copy()
+
+
+@functools.lru_cache(maxsize=128)
+def _primitive_cached(kind, thickness, scale, dims_items):
+    dims = dict(dims_items)
     meshes = []
 
     def _scale_points(points):
@@ -162,7 +275,7 @@ def _primitive_for_part(part_name, thickness, mml=None):
 
     def _scale_holes(holes):
         return [[(p[0] * scale, p[1] * scale) for p in hole] for hole in holes]
-    if "link" in name or "arm" in name:
+    if kind == "link":
         length = dims["link_length_mm"]
         width = dims["link_width_mm"]
         offset = dims["link_hole_offset_mm"]
@@ -179,13 +292,11 @@ def _primitive_for_part(part_name, thickness, mml=None):
         # 穴周りのボスリング（簡易段付き形状）。
         boss_height = max(2.0, thickness * 0.4)
         boss_outer = hole_r + 4.0
-        for center in [(offset, width / 2.0), (length - offset, width / 2.0)]:
-            ring_outline = _circle_points(center, boss_outer, segments=48)
-            ring_hole = [_circle_points(center, hole_r, segments=48)]
-            ring = _extrude_profile(ring_outline, ring_hole, boss_height, z_offset=thickness)
-            if ring:
-                meshes.append(ring)
-    elif "joint" in name:
+        centers = [(offset, width / 2.0), (length - offset, width / 2.0)]
+        rings = _ring_bosses(centers, boss_outer, hole_r, boss_height, thickness, segments=48)
+        if rings:
+            meshes.append(rings)
+    elif kind == "joint":
         outer_r = dims["joint_outer_diameter_mm"] / 2.0
         shaft_r = dims["joint_hole_diameter_mm"] / 2.0
         outline = _circle_points((0.0, 0.0), outer_r, segments=80)
@@ -196,12 +307,12 @@ def _primitive_for_part(part_name, thickness, mml=None):
         # 軸周りのボス（段付きカラー）。
         collar_outer = shaft_r + 6.0
         collar_height = max(3.0, thickness * 0.5)
-        ring_outline = _circle_points((0.0, 0.0), collar_outer, segments=72)
-        ring_hole = [_circle_points((0.0, 0.0), shaft_r, segments=48)]
-        ring = _extrude_profile(ring_outline, ring_hole, collar_height, z_offset=thickness)
+        ring = _ring_bosses(
+            [(0.0, 0.0)], collar_outer, shaft_r, collar_height, thickness, segments=72, inner_segments=48
+        )
         if ring:
             meshes.append(ring)
-    elif "base" in name:
+    elif kind == "base":
         width = dims["base_width_mm"]
         height = dims["base_height_mm"]
         fillet = min(8.0 * scale, width / 2.0, height / 2.0)
@@ -226,23 +337,20 @@ def _primitive_for_part(part_name, thickness, mml=None):
             (width - offset, height - offset),
             (offset, height - offset),
         ]
-        for center in offsets:
-            ring_outline = _circle_points(center, stand_outer, segments=36)
-            ring_hole = [_circle_points(center, hole_r, segments=36)]
-            ring = _extrude_profile(ring_outline, ring_hole, stand_height, z_offset=thickness)
-            if ring:
-                meshes.append(ring)
-    elif "end_effector" in name or "gripper" in name:
+        rings = _ring_bosses(offsets, stand_outer, hole_r, stand_height, thickness, segments=36)
+        if rings:
+            meshes.append(rings)
+    elif kind == "end_effector":
         return trimesh.creation.box(extents=(50.0 * scale, 30.0 * scale, thickness))
-    elif "shaft" in name:
+    elif kind == "shaft":
         return trimesh.creation.cylinder(
             radius=dims["shaft_diameter_mm"] / 2.0, height=80.0 * scale, sections=48
         )
-    elif "rotor" in name or "stator" in name or "motor" in name or "actuator" in name:
+    elif kind == "motor":
         return trimesh.creation.cylinder(
             radius=dims["motor_outer_diameter_mm"] / 2.0, height=40.0 * scale, sections=64
         )
-    elif "motor_mount" in name or "mount" in name:
+    elif kind == "mount":
         outline = _rounded_rect_outline(
             dims["motor_mount_width_mm"], dims["motor_mount_height_mm"], 6.0 * scale, segments=10
         )
@@ -264,19 +372,19 @@ def _primitive_for_part(part_name, thickness, mml=None):
         mesh = _extrude_profile(outline, holes, thickness)
         if mesh:
             return mesh
-    elif "bearing" in name:
+    elif kind == "bearing":
         outline = _circle_points((0.0, 0.0), dims["bearing_outer_diameter_mm"] / 2.0, segments=96)
         holes = [_circle_points((0.0, 0.0), dims["bearing_inner_diameter_mm"] / 2.0, segments=64)]
         mesh = _extrude_profile(outline, holes, thickness)
         if mesh:
             return mesh
-    elif "spacer" in name:
+    elif kind == "spacer":
         outline = _circle_points((0.0, 0.0), 15.0 * scale, segments=64)
         holes = [_circle_points((0.0, 0.0), dims["shaft_diameter_mm"] / 2.0, segments=48)]
         mesh = _extrude_profile(outline, holes, thickness)
         if mesh:
             return mesh
-    elif "bracket" in name:
+    elif kind == "bracket":
         outline = [(0.0, 0.0), (60.0, 0.0), (60.0, 15.0), (20.0, 15.0), (20.0, 50.0), (0.0, 50.0)]
         holes = [
             _circle_points((10.0, 10.0), 3.0, segments=36),
@@ -285,7 +393,7 @@ def _primitive_for_part(part_name, thickness, mml=None):
         mesh = _extrude_profile(outline, holes, thickness)
         if mesh:
             return mesh
-    elif "gear" in name:
+    elif kind == "gear":
         outline = _gear_outline(dims["gear_outer_diameter_mm"], 24)
         mesh = _extrude_profile(outline, [], thickness)
         if mesh:
@@ -303,12 +411,31 @@ def _primitive_for_part(part_name, thickness, mml=None):
     return trimesh.util.concatenate(meshes)
 
 
+# バイナリSTLの1面分のレコード（法線・3頂点・属性）
+_STL_FACE_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def write_binary_stl(mesh, out_path):
+    faces = np.empty(len(mesh.faces), dtype=_STL_FACE_DTYPE)
+    faces["normal"] = mesh.face_normals
+    faces["vertices"] = mesh.vertices[mesh.faces]
+    faces["attr"] = 0
+    with open(out_path, "wb") as f:
+        f.write(b"\0" * 80)
+        f.write(np.uint32(len(faces)).tobytes())
+        f.write(faces.tobytes())
+
+
 def write_stl(mml, out_path):
     outline = mml.get("geometry", {}).get("outline", {}).get("points_mm", [])
     thickness = _thickness_from_mml(mml)
     if not outline:
         mesh = _primitive_for_part(mml.get("part"), thickness, mml=mml)
-        mesh.export(out_path)
+        write_binary_stl(mesh, out_path)
         return True
 
     holes = []
@@ -318,31 +445,28 @@ def write_stl(mml, out_path):
         if center and diameter:
             holes.append(_circle_points(center, float(diameter) / 2.0, segments=32))
 
-    poly = Polygon(outline, holes)
-    if not poly.is_valid:
-        poly = poly.buffer(0)
-    if poly.is_empty:
+    # 利用者の輪郭は妥当とは限らないため、GEOS で判定して必要なら修復する
+    mesh = _extrude_profile(outline, holes, thickness, trust_input=False)
+    if mesh is None:
         return False
 
-    mesh = trimesh.creation.extrude_polygon(poly, height=thickness, triangulate_kwargs={"engine": "earcut"})
-
     part_name = (mml.get("part") or "").lower()
     holes_mm = mml.get("geometry", {}).get("holes", []) or []
     bosses = []
     if holes_mm and ("link" in part_name or "arm" in part_name or "base" in part_name):
         boss_height = max(2.0, thickness * 0.4)
+        # 同じ穴径のボスは同形状なので、穴径ごとに1回だけ押し出して各中心へ複製する
+        centers_by_radius = {}
         for h in holes_mm:
             center = h.get("center_mm")
             dia = h.get("diameter_mm")
             if not center or not dia:
                 continue
-            hole_r = float(dia) / 2.0
-            boss_outer = hole_r + 4.0
-            ring_outline = _circle_points(center, boss_outer, segments=48)
-            ring_hole = [_circle_points(center, hole_r, segments=48)]
-            ring = _extrude_profile(ring_outline, ring_hole, boss_height, z_offset=thickness)
-            if ring:
-                bosses.append(ring)
+            centers_by_radius.setdefault(float(dia) / 2.0, []).append((center[0], center[1]))
+        for hole_r, centers in centers_by_radius.items():
+            rings = _ring_bosses(centers, hole_r + 4.0, hole_r, boss_height, thickness, segments=48)
+            if rings:
+                bosses.append(rings)
     elif holes_mm and "joint" in part_name:
         h = holes_mm[0]
         center = h.get("center_mm")
@@ -351,14 +475,15 @@ def write_stl(mml, out_path):
             hole_r = float(dia) / 2.0
             collar_outer = hole_r + 6.0
             collar_height = max(3.0, thickness * 0.5)
-            ring_outline = _circle_points(center, collar_outer, segments=72)
-            ring_hole = [_circle_points(center, hole_r, segments=48)]
-            ring = _extrude_profile(ring_outline, ring_hole, collar_height, z_offset=thickness)
+            ring = _ring_bosses(
+                [(center[0], center[1])], collar_outer, hole_r, collar_height, thickness,
+                segments=72, inner_segments=48,
+            )
             if ring:
                 bosses.append(ring)
 
     if bosses:
         mesh = trimesh.util.concatenate([mesh] + bosses)
 
-    mesh.export(out_path)
+    write_binary_stl(mesh, out_path)
     return True
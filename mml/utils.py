@@ -2,14 +2,35 @@ import json
 import os
 import time
 
+try:
+    import orjson
+except ImportError:  # orjson は任意依存
+    orjson = None
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
 
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 
 def write_json(path, data):
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass  # orjson が扱えない値は標準の json で書き出す
+        else:
+            with open(path, "wb") as f:
+                f.write(payload)
+            return
+    # json.dump は細かい断片ごとに write するので、一括で文字列化して1回で書く
+    text = json.dumps(data, ensure_ascii=False, indent=2)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(text)
 
 
 def read_json(path):
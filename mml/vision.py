@@ -17,115 +17,115 @@ def _preprocess(gray):
     return clean, edges
 
 
-def _resample_points(points, max_points=1200):
-    if len(points) <= max_points:
-        return points
-    step = len(points) / float(max_points)
-    return [points[int(i * step)] for i in range(max_points)]
-
-
-def _find_outline(binary):
+def _find_outline(binary, max_points=1200):
     contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
     if not contours:
         return None
-    largest = max(contours, key=cv2.contourArea)
-    points = [[int(p[0][0]), int(p[0][1])] for p in largest]
-    if len(points) < 3:
+    largest = max(contours, key=cv2.contourArea).reshape(-1, 2)
+    if len(largest) < 3:
         return None
-    return _resample_points(points)
+    # 点数は形状判定（intent の点数しきい値）に使うため、輪郭を簡略化せず等間隔に間引く
+    if len(largest) > max_points:
+        step = len(largest) / float(max_points)
+        largest = largest[(np.arange(max_points) * step).astype(np.int64)]
+    return largest.tolist()
 
 
-def _find_holes(gray, binary):
-    # 1) 外部輪郭による穴検出（従来方式）
-    contours_ext, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    holes = []
-    if not contours_ext:
-        contours_ext = []
-    max_area = max((cv2.contourArea(c) for c in contours_ext), default=0)
-    for c in contours_ext:
-        area = cv2.contourArea(c)
-        if max_area > 0 and area >= max_area * 0.9:
-            continue
-        if area < 20:
-            continue
-        peri = cv2.arcLength(c, True)
-        if peri == 0:
-            continue
-        circularity = 4 * np.pi * area / (peri * peri)
-        if circularity < 0.65:
+def _merge_close_holes(holes):
+    # 中心間距離が大きい方の半径未満の穴をまとめ、信頼度の高い方を残す。
+    # 最大半径のグリッドに振り分け、近傍9セルの穴だけを比較する
+    centers = np.array([h["center_px"] for h in holes], dtype=np.float64)
+    radii = np.array([h["radius_px"] for h in holes], dtype=np.float64)
+    cell = max(float(radii.max()), 1.0)
+    keys = np.floor(centers / cell).astype(np.int64)
+    grid = {}
+    for i, (kx, ky) in enumerate(keys.tolist()):
+        grid.setdefault((kx, ky), []).append(i)
+
+    merged = []
+    used = np.zeros(len(holes), dtype=bool)
+    for i, (kx, ky) in enumerate(keys.tolist()):
+        if used[i]:
             continue
-        (x, y), r = cv2.minEnclosingCircle(c)
+        best = holes[i]
+        near = [
+            j
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for j in grid.get((kx + dx, ky + dy), ())
+            if j > i
+        ]
+        if near:
+            near = np.array(sorted(near))
+            near = near[~used[near]]
+            dist = np.hypot(centers[near, 0] - centers[i, 0], centers[near, 1] - centers[i, 1])
+            for j in near[dist < np.maximum(radii[i], radii[near])].tolist():
+                used[j] = True
+                if holes[j]["confidence"] > best["confidence"]:
+                    best = holes[j]
+        merged.append(best)
+    return merged
+
+
+def _contour_areas(contours):
+    return np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+
+
+def _circular_holes(contours, areas, keep):
+    # 面積と周長から円形度を配列でまとめて判定し、残った輪郭だけ外接円を求める
+    idx = np.flatnonzero(keep & (areas >= 20))
+    peris = np.fromiter(
+        (cv2.arcLength(contours[i], True) for i in idx), dtype=np.float64, count=len(idx)
+    )
+    valid = peris > 0
+    idx, peris = idx[valid], peris[valid]
+    circularity = 4 * np.pi * areas[idx] / (peris * peris)
+    is_round = circularity >= 0.65
+    holes = []
+    for i, circ in zip(idx[is_round].tolist(), circularity[is_round].tolist()):
+        (x, y), r = cv2.minEnclosingCircle(contours[i])
         holes.append(
             {
                 "center_px": [float(x), float(y)],
                 "radius_px": float(r),
-                "confidence": float(min(1.0, circularity)),
+                "confidence": float(min(1.0, circ)),
             }
         )
+    return holes
+
+
+def _find_holes(gray, binary):
+    # 1) 外部輪郭による穴検出（従来方式）
+    contours_ext, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours_ext:
+        contours_ext = []
+    areas_ext = _contour_areas(contours_ext)
+    max_area = float(areas_ext.max()) if len(areas_ext) else 0
+    # 外形（最大輪郭に近い面積のもの）は除く
+    keep = ~((max_area > 0) & (areas_ext >= max_area * 0.9))
+    holes = _circular_holes(contours_ext, areas_ext, keep)
     if holes:
         return holes
 
     # 2) 輪郭階層による内部穴検出（最大輪郭の全子孫から円形を探す）
     contours_tree, hierarchy = cv2.findContours(binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
     if contours_tree and hierarchy is not None:
-        largest_idx = max(range(len(contours_tree)), key=lambda i: cv2.contourArea(contours_tree[i]))
-        largest_area = cv2.contourArea(contours_tree[largest_idx])
-        # 最大輪郭の全子孫を収集
-        descendants = set()
-        queue = []
-        # 直接の子を探す
-        for i in range(len(contours_tree)):
-            if hierarchy[0][i][3] == largest_idx:
-                queue.append(i)
-                descendants.add(i)
-        # 子孫を再帰的に収集
-        while queue:
-            parent = queue.pop(0)
-            for i in range(len(contours_tree)):
-                if hierarchy[0][i][3] == parent and i not in descendants:
-                    descendants.add(i)
-                    queue.append(i)
-        for i in descendants:
-            area = cv2.contourArea(contours_tree[i])
-            if area < 20:
-                continue
-            # 親の面積の50%を超える大きな輪郭は穴ではない
-            if largest_area > 0 and area > largest_area * 0.5:
-                continue
-            peri = cv2.arcLength(contours_tree[i], True)
-            if peri == 0:
-                continue
-            circularity = 4 * np.pi * area / (peri * peri)
-            if circularity < 0.65:
-                continue
-            (x, y), r = cv2.minEnclosingCircle(contours_tree[i])
-            holes.append(
-                {
-                    "center_px": [float(x), float(y)],
-                    "radius_px": float(r),
-                    "confidence": float(min(1.0, circularity)),
-                }
-            )
+        areas = _contour_areas(contours_tree)
+        largest_idx = int(np.argmax(areas))
+        largest_area = float(areas[largest_idx])
+        # 最大輪郭の全子孫を収集（親配列上で世代ごとにまとめて辿る）
+        parents = hierarchy[0, :, 3]
+        is_descendant = np.zeros(len(parents), dtype=bool)
+        frontier = parents == largest_idx
+        while frontier.any():
+            is_descendant |= frontier
+            frontier = np.isin(parents, np.flatnonzero(frontier)) & ~is_descendant
+        # 親の面積の50%を超える大きな輪郭は穴ではない
+        keep = is_descendant & ~((largest_area > 0) & (areas > largest_area * 0.5))
+        holes = _circular_holes(contours_tree, areas, keep)
         # 重複を除去（近接する穴をマージ）
         if holes:
-            merged = []
-            used = [False] * len(holes)
-            for i, h in enumerate(holes):
-                if used[i]:
-                    continue
-                best = h
-                for j in range(i + 1, len(holes)):
-                    if used[j]:
-                        continue
-                    dx = h["center_px"][0] - holes[j]["center_px"][0]
-                    dy = h["center_px"][1] - holes[j]["center_px"][1]
-                    dist = (dx * dx + dy * dy) ** 0.5
-                    if dist < max(h["radius_px"], holes[j]["radius_px"]):
-                        used[j] = True
-                        if holes[j]["confidence"] > best["confidence"]:
-                            best = holes[j]
-                merged.append(best)
-            holes = merged
+            holes = _merge_close_holes(holes)
     if holes:
         return holes
 
@@ -148,7 +148,7 @@ def _find_holes(gray, binary):
     # 外形輪郭の内部にある円のみ保持
     outline_cnt = None
     if contours_ext:
-        outline_cnt = max(contours_ext, key=cv2.contourArea)
+        outline_cnt = contours_ext[int(np.argmax(areas_ext))]
 
     for (x, y, r) in circles[0]:
         if outline_cnt is not None:
@@ -175,24 +175,21 @@ def _find_bend_lines(edges, outline_points):
     lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=80, minLineLength=40, maxLineGap=5)
     if lines is None:
         return []
-    bend_lines = []
-    outline_cnt = None
+    segs = lines.reshape(-1, 4)
+    lengths = np.hypot(segs[:, 2] - segs[:, 0], segs[:, 3] - segs[:, 1])
+    keep = lengths >= 50
     if outline_points:
-        outline_cnt = np.array(outline_points, dtype=np.int32)
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
-        length = np.hypot(x2 - x1, y2 - y1)
-        if length < 50:
-            continue
-        if outline_cnt is not None:
-            mx, my = (x1 + x2) / 2.0, (y1 + y2) / 2.0
-            inside = cv2.pointPolygonTest(outline_cnt, (mx, my), False) >= 0
-            if not inside:
-                continue
+        # 外形を1回だけ塗りつぶし、中点の内外判定は画素参照でまとめて行う
+        outline_mask = np.zeros(edges.shape[:2], dtype=np.uint8)
+        cv2.fillPoly(outline_mask, [np.array(outline_points, dtype=np.int32)], 1)
+        h, w = outline_mask.shape
+        mx = np.clip(np.rint((segs[:, 0] + segs[:, 2]) * 0.5).astype(np.intp), 0, w - 1)
+        my = np.clip(np.rint((segs[:, 1] + segs[:, 3]) * 0.5).astype(np.intp), 0, h - 1)
+        keep &= outline_mask[my, mx].astype(bool)
+    bend_lines = []
+    for (x1, y1, x2, y2), length in zip(segs[keep].tolist(), lengths[keep].tolist()):
         conf = min(1.0, length / 200.0)
-        bend_lines.append(
-            {"line_px": [[int(x1), int(y1)], [int(x2), int(y2)]], "confidence": float(conf)}
-        )
+        bend_lines.append({"line_px": [[x1, y1], [x2, y2]], "confidence": conf})
     return bend_lines
 
 
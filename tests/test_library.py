@@ -0,0 +1,107 @@
+import math
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import trimesh
+
+from mml.library.generators import _numeric
+from mml.library.generators._geom import cached_generator
+from mml.library.generators.gear_generators import generate_rack
+
+
+class RackTests(unittest.TestCase):
+    def test_rack_teeth_reach_full_height(self):
+        # 歯形の外形が自己交差すると歯先が欠け、高さが height_mm に届かなくなる
+        mesh = generate_rack(module=1.5, teeth_count=20, face_width_mm=15.0, height_mm=20.0)
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = mesh.bounds.tolist()
+        self.assertAlmostEqual(min_x, 0.0)
+        self.assertAlmostEqual(min_y, 0.0)
+        self.assertAlmostEqual(min_z, 0.0)
+        self.assertAlmostEqual(max_x, math.pi * 1.5 * 20)
+        self.assertAlmostEqual(max_y, 20.0)
+        self.assertAlmostEqual(max_z, 15.0)
+        self.assertTrue(mesh.is_watertight)
+        self.assertAlmostEqual(mesh.volume, 24502.07, delta=1.0)
+
+
+class CachedGeneratorTests(unittest.TestCase):
+    def test_returns_independent_copies(self):
+        calls = []
+
+        @cached_generator
+        def generate_block(size_mm=10.0):
+            calls.append(size_mm)
+            return trimesh.creation.box((size_mm, size_mm, size_mm))
+
+        first = generate_block(size_mm=12.5)
+        original = first.vertices.copy()
+        # 返されたメッシュを変更しても、キャッシュ本体と次の戻り値には影響しない
+        first.apply_translation((100.0, 0.0, 0.0))
+        first.vertices[0] = (-1.0, -1.0, -1.0)
+
+        second = generate_block(size_mm=12.5)
+        self.assertEqual(calls, [12.5])
+        self.assertIsNot(first, second)
+        np.testing.assert_array_equal(second.vertices, original)
+
+        third = generate_block(size_mm=12.5)
+        self.assertIsNot(second, third)
+        np.testing.assert_array_equal(third.vertices, original)
+
+    def test_positional_arguments_bypass_cache(self):
+        calls = []
+
+        @cached_generator
+        def generate_block(size_mm=10.0):
+            calls.append(size_mm)
+            return trimesh.creation.box((size_mm, size_mm, size_mm))
+
+        generate_block(7.0)
+        generate_block(7.0)
+        self.assertEqual(calls, [7.0, 7.0])
+
+
+class NumericKernelTests(unittest.TestCase):
+    def _expected_profile(self, module, teeth_count):
+        radii = _numeric._tooth_radii(module, teeth_count)
+        tooth_angle = math.tau / teeth_count
+        points = []
+        for i in range(teeth_count):
+            for r, k in zip(radii, _numeric._TOOTH_OFFSETS):
+                angle = i * tooth_angle + k * tooth_angle * 0.25
+                points.append((r * math.cos(angle), r * math.sin(angle)))
+        return np.array(points)
+
+    def test_tooth_profile_numpy_fallback(self):
+        # Numba の有無に関わらず NumPy 版を通す
+        with mock.patch.object(_numeric, "NUMBA_AVAILABLE", False):
+            profile = _numeric.tooth_profile(2.0, 24)
+        self.assertEqual(profile.shape, (24 * 7, 2))
+        np.testing.assert_allclose(profile, self._expected_profile(2.0, 24), atol=1e-12)
+
+    def test_tooth_profile_default_matches_fallback(self):
+        with mock.patch.object(_numeric, "NUMBA_AVAILABLE", False):
+            fallback = _numeric.tooth_profile(1.5, 37)
+        np.testing.assert_allclose(_numeric.tooth_profile(1.5, 37), fallback, atol=1e-12)
+
+    def test_circle_points(self):
+        points = _numeric.circle_points(3.0, -2.0, 5.0, 16)
+        theta = np.linspace(0.0, math.tau, 16, endpoint=False)
+        expected = np.stack([3.0 + 5.0 * np.cos(theta), -2.0 + 5.0 * np.sin(theta)], axis=1)
+        np.testing.assert_allclose(points, expected, atol=1e-12)
+
+    def test_import_does_not_load_numba(self):
+        code = "import sys, mml.library.generators._numeric; print('numba' in sys.modules)"
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=repo_root
+        )
+        self.assertEqual(proc.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
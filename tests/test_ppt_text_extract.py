@@ -0,0 +1,133 @@
+import importlib.util
+import io
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+_TOOL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools", "ppt_text_extract.py")
+
+_spec = importlib.util.spec_from_file_location("ppt_text_extract", _TOOL_PATH)
+ppt_text_extract = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ppt_text_extract)
+
+# 窓に分ける前の抽出（ストリーム全体をデコードして正規表現で探す）
+_TEXT_RUN = re.compile(r"[^\x00-\x08\x0b\x0c\x0e-\x1f]{4,}")
+
+
+def _reference_texts(data):
+    decoded = data.decode("utf-16le", errors="ignore")
+    texts = (m.group(0).strip() for m in _TEXT_RUN.finditer(decoded))
+    return [t for t in texts if len(t) >= 4]
+
+
+def _scanned_texts(data, sizes):
+    chunks = []
+    pos = 0
+    for size in sizes:
+        if pos >= len(data):
+            break
+        chunks.append(data[pos:pos + size])
+        pos += size
+    chunks.append(data[pos:])
+    texts = map(str.strip, ppt_text_extract._iter_ppt_text(chunks))
+    return [t for t in texts if len(t) >= 4]
+
+
+def _random_stream(rng):
+    words = ["Hello", "スライド", "abc", "図面の説明", "  x  ", "Title Text", "\t\n  ", "ab", "\U0001f600絵文字"]
+    parts = []
+    for _ in range(rng.randint(0, 200)):
+        r = rng.random()
+        if r < 0.4:
+            parts.append(rng.choice(words).encode("utf-16le"))
+        elif r < 0.7:
+            parts.append(bytes(rng.randrange(0, 32) for _ in range(rng.randint(1, 8))))
+        elif r < 0.8:
+            parts.append(b"\x00" * rng.randint(1, 50))
+        else:
+            parts.append(bytes(rng.randrange(256) for _ in range(rng.randint(1, 30))))
+    return b"".join(parts)
+
+
+class PptScannerTests(unittest.TestCase):
+    def test_text_split_across_windows(self):
+        data = b"\x01\x00" + "Slide Title".encode("utf-16le") + b"\x00\x00" + "本文テキスト".encode("utf-16le")
+        expected = ["Slide Title", "本文テキスト"]
+        # 文字の途中（奇数バイト）や区間の途中で窓が切れても結果は変わらない
+        for size in (1, 2, 3, 5, 7, 16, len(data)):
+            with self.subTest(size=size):
+                self.assertEqual(_scanned_texts(data, [size] * len(data)), expected)
+
+    def test_matches_whole_stream_decode(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            data = _random_stream(rng)
+            sizes = [rng.randint(1, 64) for _ in range(len(data))]
+            self.assertEqual(_scanned_texts(data, sizes), _reference_texts(data))
+
+    def test_trailing_run_is_flushed(self):
+        data = "末尾の文字列".encode("utf-16le") + b"\x41"
+        self.assertEqual(_scanned_texts(data, [4] * len(data)), ["末尾の文字列"])
+
+
+class BatchModeTests(unittest.TestCase):
+    def _run_batch(self, stdin_text, as_json=False):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(sys, "stdin", io.StringIO(stdin_text)), \
+                mock.patch.object(sys, "stdout", stdout), \
+                mock.patch.object(sys, "stderr", stderr):
+            try:
+                ppt_text_extract._run_batch(as_json)
+                code = 0
+            except SystemExit as e:
+                code = e.code
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_one_failure_sets_exit_status(self):
+        slides = [{"slide": 1, "texts": ["Hello"]}]
+
+        def fake_extract(path):
+            if path == "bad.pptx":
+                raise RuntimeError("broken")
+            return slides
+
+        with mock.patch.object(ppt_text_extract, "_extract", side_effect=fake_extract):
+            code, out, err = self._run_batch("good.pptx\nbad.pptx\n\n")
+        # 失敗したパスがあっても他のパスの結果は出力し、終了コードは1にする
+        self.assertEqual(code, 1)
+        self.assertIn("== good.pptx ==", out)
+        self.assertIn("- Hello", out)
+        self.assertNotIn("bad.pptx", out)
+        self.assertIn("bad.pptx: broken", err)
+
+    def test_all_success_exits_normally(self):
+        with mock.patch.object(ppt_text_extract, "_extract", return_value=[]):
+            code, _, err = self._run_batch("a.pptx\nb.ppt\n")
+        self.assertEqual(code, 0)
+        self.assertEqual(err, "")
+
+    def test_cli_exit_status_for_missing_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = os.path.join(tmp, "missing.pptx")
+            unsupported = os.path.join(tmp, "notes.txt")
+            with open(unsupported, "w") as f:
+                f.write("text")
+            proc = subprocess.run(
+                [sys.executable, _TOOL_PATH, "--batch", "--json"],
+                input=f"{missing}\n{unsupported}\n",
+                capture_output=True,
+                text=True,
+            )
+        self.assertEqual(proc.returncode, 1)
+        self.assertEqual(proc.stdout.strip(), "[]")
+        self.assertIn(f"File not found: {missing}", proc.stderr)
+        self.assertIn("Only .ppt or .pptx is supported", proc.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
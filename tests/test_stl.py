@@ -0,0 +1,59 @@
+import math
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+import trimesh
+
+from mml.library.generators.gear_generators import generate_rack
+from mml.stl import _ring_bosses, write_binary_stl
+
+
+class BinaryStlTests(unittest.TestCase):
+    def _write(self, mesh):
+        with tempfile.TemporaryDirectory() as tmp:
+            out_path = os.path.join(tmp, "model.stl")
+            write_binary_stl(mesh, out_path)
+            with open(out_path, "rb") as f:
+                return f.read()
+
+    def test_matches_trimesh_export(self):
+        # 以前の書き出し（trimesh の export）とバイト単位で一致すること
+        for mesh in (trimesh.creation.box((10.0, 20.0, 3.0)), generate_rack()):
+            data = self._write(mesh)
+            self.assertEqual(data, trimesh.exchange.stl.export_stl(mesh))
+
+    def test_layout(self):
+        mesh = trimesh.creation.box((10.0, 20.0, 3.0))
+        data = self._write(mesh)
+        self.assertEqual(data[:80], b"\0" * 80)
+        (count,) = struct.unpack("<I", data[80:84])
+        self.assertEqual(count, len(mesh.faces))
+        self.assertEqual(len(data), 84 + 50 * count)
+
+        loaded = trimesh.load(trimesh.util.wrap_as_stream(data), file_type="stl")
+        self.assertEqual(len(loaded.faces), len(mesh.faces))
+        self.assertAlmostEqual(loaded.volume, mesh.volume, places=4)
+
+
+class RingBossTests(unittest.TestCase):
+    def test_bosses_are_placed_at_centers(self):
+        centers = [(0.0, 0.0), (40.0, 10.0), (-25.0, 30.0)]
+        for inner_segments in (None, 48):
+            with self.subTest(inner_segments=inner_segments):
+                mesh = _ring_bosses(centers, 10.0, 4.0, 5.0, 2.0, segments=72, inner_segments=inner_segments)
+                self.assertTrue(mesh.is_watertight)
+                self.assertAlmostEqual(mesh.bounds[0][2], 2.0)
+                self.assertAlmostEqual(mesh.bounds[1][2], 7.0)
+                # 各ボスは頂点を連続したブロックとして持つので、ブロックの重心が中心に一致する
+                blocks = mesh.vertices.reshape(len(centers), -1, 3)
+                np.testing.assert_allclose(blocks[:, :, :2].mean(axis=1), centers, atol=1e-9)
+                # 多角形近似の分だけ小さくなるが、円環の体積に近い
+                expected = len(centers) * math.pi * (10.0 ** 2 - 4.0 ** 2) * 5.0
+                self.assertAlmostEqual(mesh.volume / expected, 1.0, delta=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import math
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from mml.intent import infer_part_from_vision
+from mml.vision import _merge_close_holes, run_vision
+
+
+def _blank_canvas(width, height):
+    return np.full((height, width, 3), 255, dtype=np.uint8)
+
+
+def _filled_plate(rect, holes):
+    x1, y1, x2, y2 = rect
+    img = _blank_canvas(x2 + 30, y2 + 30)
+    cv2.rectangle(img, (x1, y1), (x2, y2), (0, 0, 0), -1)
+    for (cx, cy, r) in holes:
+        cv2.circle(img, (cx, cy), r, (255, 255, 255), -1)
+    return img
+
+
+def _gear_blank(center, outer_r, root_r, teeth, bore_r):
+    cx, cy = center
+    img = _blank_canvas(2 * cx, 2 * cy)
+    points = []
+    for i in range(teeth * 4):
+        r = outer_r if (i // 2) % 2 == 0 else root_r
+        t = 2.0 * math.pi * i / (teeth * 4)
+        points.append((cx + r * math.cos(t), cy + r * math.sin(t)))
+    cv2.fillPoly(img, [np.round(points).astype(np.int32)], (0, 0, 0))
+    cv2.circle(img, (cx, cy), bore_r, (255, 255, 255), -1)
+    return img
+
+
+def _hole(x, y, r, confidence):
+    return {"center_px": [x, y], "radius_px": r, "confidence": confidence}
+
+
+def _merge_close_holes_pairwise(holes):
+    # グリッド化する前の総当たり版（比較用）
+    merged = []
+    used = [False] * len(holes)
+    for i, h in enumerate(holes):
+        if used[i]:
+            continue
+        best = h
+        for j in range(i + 1, len(holes)):
+            if used[j]:
+                continue
+            dx = h["center_px"][0] - holes[j]["center_px"][0]
+            dy = h["center_px"][1] - holes[j]["center_px"][1]
+            dist = (dx * dx + dy * dy) ** 0.5
+            if dist < max(h["radius_px"], holes[j]["radius_px"]):
+                used[j] = True
+                if holes[j]["confidence"] > best["confidence"]:
+                    best = holes[j]
+        merged.append(best)
+    return merged
+
+
+class MergeCloseHolesTests(unittest.TestCase):
+    def test_close_pair_keeps_higher_confidence(self):
+        holes = [_hole(100.0, 100.0, 10.0, 0.5), _hole(104.0, 103.0, 8.0, 0.9)]
+        self.assertEqual(_merge_close_holes(holes), [holes[1]])
+        self.assertEqual(_merge_close_holes_pairwise(holes), [holes[1]])
+
+    def test_far_pair_is_kept(self):
+        # 中心間距離が大きい方の半径以上なら別の穴として残す
+        holes = [_hole(100.0, 100.0, 10.0, 0.5), _hole(110.0, 100.0, 8.0, 0.9)]
+        self.assertEqual(_merge_close_holes(holes), holes)
+        self.assertEqual(_merge_close_holes_pairwise(holes), holes)
+
+    def test_matches_pairwise_merge(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            n = int(rng.integers(1, 40))
+            extent = float(rng.choice([50.0, 200.0, 1000.0]))
+            holes = [
+                _hole(float(x), float(y), float(r), float(c))
+                for x, y, r, c in zip(
+                    rng.uniform(0.0, extent, n),
+                    rng.uniform(0.0, extent, n),
+                    rng.uniform(0.5, 30.0, n),
+                    rng.uniform(0.0, 1.0, n),
+                )
+            ]
+            self.assertEqual(_merge_close_holes(holes), _merge_close_holes_pairwise(holes))
+
+
+class VisionIntentTests(unittest.TestCase):
+    def _vision(self, img):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = os.path.join(tmp, "input.png")
+            cv2.imwrite(image_path, img)
+            return run_vision(image_path)
+
+    def test_outline_keeps_point_density(self):
+        # intent の判定は輪郭の点数を見るため、直線の輪郭も頂点だけに簡略化しない
+        img = _filled_plate((30, 30, 270, 170), [])
+        vision = self._vision(img)
+        self.assertGreaterEqual(len(vision["outline"]["points_px"]), 24)
+        self.assertEqual(vision["outline"]["type"], "spline")
+
+    def test_rect_plate_with_holes_label(self):
+        holes = [(70, 70, 12), (230, 70, 12), (70, 130, 12), (230, 130, 12)]
+        vision = self._vision(_filled_plate((30, 30, 270, 170), holes))
+        self.assertEqual(len(vision["holes"]), 4)
+        self.assertEqual(infer_part_from_vision(vision)["label"], "Gear")
+
+    def test_gear_blank_label(self):
+        vision = self._vision(_gear_blank((150, 150), 120, 100, 10, 25))
+        self.assertEqual(len(vision["holes"]), 1)
+        self.assertEqual(infer_part_from_vision(vision)["label"], "Gear")
+
+
+if __name__ == "__main__":
+    unittest.main()
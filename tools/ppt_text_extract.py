@@ -1,94 +1,232 @@
 import argparse
+import contextlib
+import functools
 import json
+import mmap
 import os
-import re
+import sys
 
-import olefile
+# olefile / python-pptx / numpy は読み込みが重いため、使う形式の抽出関数内で import する
 
-try:
-    from pptx import Presentation
-except Exception:
-    Presentation = None
+_NAMESPACES = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+}
+_BR_TAG = "{%s}br" % _NAMESPACES["a"]
+
+# 制御文字以外を文字列の一部とみなす。0x1f 以下の文字は下位バイトだけで決まるため、
+# 下位バイトを bytes.translate で 0/1 に写す表を用意しておく
+_CONTROL_CODES = frozenset([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20)])
+_LOW_BYTE_CLASS = bytes(0 if i in _CONTROL_CODES else 1 for i in range(256))
+
+# 走査を行う窓の大きさ（バイト）。判定表と中間配列が L2 キャッシュに収まる程度にする
+_SCAN_WINDOW = 1 << 18
+
+
+def _iter_ppt_text(chunks):
+    # 窓ごとに2バイト単位の判定表を引き、4文字以上続く区間だけを文字列にする。
+    # 窓の末尾で途切れる区間（と端数の1バイト）は次の窓の先頭へ持ち越す。
+    import numpy as np
+
+    carry = b""
+    for chunk in chunks:
+        buf = carry + chunk
+        n = len(buf) // 2
+        units = np.frombuffer(buf, dtype="<u2", count=n)
+        low_class = np.frombuffer(buf[0:2 * n:2].translate(_LOW_BYTE_CLASS), dtype=bool)
+        is_text = (units > 0x1f) | low_class
+        edges = np.flatnonzero(np.diff(is_text, prepend=False, append=False))
+        starts, ends = edges[0::2], edges[1::2]
+        if len(ends) and ends[-1] == n:
+            carry = buf[2 * starts[-1]:]
+            starts, ends = starts[:-1], ends[:-1]
+        else:
+            carry = buf[2 * n:]
+        keep = ends - starts >= 4
+        starts, ends = starts[keep].tolist(), ends[keep].tolist()
+        if ((units >= 0xd800) & (units < 0xe000)).any():
+            # サロゲートを含む窓は区間ごとにデコードする（対にならないものは捨てる）
+            for s, e in zip(starts, ends):
+                yield buf[2 * s:2 * e].decode("utf-16le", errors="ignore")
+        else:
+            # 1文字=2バイトなので、窓全体を1回デコードして区間を切り出す
+            text = buf[:2 * n].decode("utf-16le")
+            for s, e in zip(starts, ends):
+                yield text[s:e]
+    if len(carry) >= 8:
+        yield carry.decode("utf-16le", errors="ignore")
+
+
+@functools.lru_cache(maxsize=None)
+def _slide_xpaths():
+    # python-pptx の shape.text と同じ範囲（スライド直下の p:sp のテキスト）を lxml で直接読む
+    from lxml import etree
+
+    return (
+        etree.XPath("./p:cSld/p:spTree/p:sp/p:txBody", namespaces=_NAMESPACES),
+        etree.XPath("./a:p", namespaces=_NAMESPACES),
+        etree.XPath("./a:r/a:t | ./a:br | ./a:fld/a:t", namespaces=_NAMESPACES),
+    )
+
+
+def _txbody_text(txbody, paragraph_xpath, run_text_xpath):
+    # 段落は改行、段落内の改行（a:br）は垂直タブで連結する（shape.text と同じ）
+    return "\n".join(
+        "".join("\v" if el.tag == _BR_TAG else (el.text or "") for el in run_text_xpath(p))
+        for p in paragraph_xpath(txbody)
+    )
+
+
+def _slide_texts(root):
+    txbody_xpath, paragraph_xpath, run_text_xpath = _slide_xpaths()
+    texts = []
+    for txbody in txbody_xpath(root):
+        t = _txbody_text(txbody, paragraph_xpath, run_text_xpath).strip()
+        if t:
+            texts.append(t)
+    return texts
+
+
+@contextlib.contextmanager
+def _mapped_file(path):
+    # ファイル全体を読み込まず、OS のページキャッシュから必要な部分だけ読ませる
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield f  # 空ファイルは mmap できないためそのまま渡す
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
 
 
 def _extract_pptx(path):
+    try:
+        from pptx import Presentation
+    except Exception:
+        Presentation = None
     if Presentation is None:
         raise RuntimeError("python-pptx is not available")
-    prs = Presentation(path)
+    with _mapped_file(path) as fp:
+        prs = Presentation(fp)
     slides = []
     for i, slide in enumerate(prs.slides, start=1):
-        texts = []
-        for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                t = shape.text.strip()
-                if t:
-                    texts.append(t)
+        texts = _slide_texts(slide._element)
         if texts:
             slides.append({"slide": i, "texts": texts})
     return slides
 
 
 def _extract_ppt(path):
-    if not olefile.isOleFile(path):
-        raise RuntimeError("Not an OLE (ppt) file")
-    ole = olefile.OleFileIO(path)
-    if not ole.exists("PowerPoint Document"):
-        ole.close()
-        raise RuntimeError("PowerPoint Document stream not found")
-    data = ole.openstream("PowerPoint Document").read()
-    ole.close()
-
-    # ヒューリスティック: UTF-16LEっぽい文字列を一定長以上で抽出。
-    texts = []
-    try:
-        decoded = data.decode("utf-16le", errors="ignore")
-        for m in re.finditer(r"[^\x00-\x08\x0b\x0c\x0e-\x1f]{4,}", decoded):
-            text = m.group(0).strip()
-            if text and len(text) >= 4:
-                texts.append(text)
-    except Exception:
-        texts = []
-    # 順序を保ったまま重複を除去。
-    seen = set()
-    uniq = []
-    for t in texts:
-        if t in seen:
-            continue
-        seen.add(t)
-        uniq.append(t)
+    import olefile
+
+    with _mapped_file(path) as fp:
+        if not olefile.isOleFile(fp):
+            raise RuntimeError("Not an OLE (ppt) file")
+        ole = olefile.OleFileIO(fp)
+        try:
+            if not ole.exists("PowerPoint Document"):
+                raise RuntimeError("PowerPoint Document stream not found")
+            stream = ole.openstream("PowerPoint Document")
+            try:
+                # ヒューリスティック: UTF-16LEっぽい文字列を一定長以上で抽出。
+                # ストリームは窓の大きさずつ読み、全体を1つの bytes にしない。
+                # 見つけた時点で順序を保ったまま重複を除き、重複した断片は保持しない。
+                try:
+                    windows = iter(functools.partial(stream.read, _SCAN_WINDOW), b"")
+                    fragments = map(str.strip, _iter_ppt_text(windows))
+                    uniq = list(dict.fromkeys(t for t in fragments if len(t) >= 4))
+                except Exception:
+                    uniq = []
+            finally:
+                stream.close()
+        finally:
+            ole.close()
     return [{"slide": None, "texts": uniq}]
 
 
+def _extract(path):
+    if not os.path.exists(path):
+        raise SystemExit(f"File not found: {path}")
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pptx":
+        return _extract_pptx(path)
+    if ext == ".ppt":
+        return _extract_ppt(path)
+    raise SystemExit("Only .ppt or .pptx is supported")
+
+
+def _report_lines(slides):
+    lines = []
+    for slide in slides:
+        if slide["slide"] is None:
+            lines.append("PPT Text:")
+        else:
+            lines.append(f"Slide {slide['slide']}:")
+        lines.extend(f"- {t}" for t in slide["texts"])
+        lines.append("")
+    return lines
+
+
+def _run_batch(as_json):
+    # 標準入力の1行1パスを同じプロセスで順に処理し、import や初期化を1回で済ませる。
+    # 読めないファイルは標準エラーに出して続行し、最後に終了コードで知らせる。
+    results = []
+    failed = False
+    for line in sys.stdin:
+        path = line.strip()
+        if not path:
+            continue
+        try:
+            slides = _extract(path)
+        except SystemExit as e:
+            sys.stderr.write(f"{path}: {e.code}\n")
+            failed = True
+            continue
+        except Exception as e:
+            sys.stderr.write(f"{path}: {e}\n")
+            failed = True
+            continue
+        results.append({"path": path, "slides": slides})
+
+    if as_json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        lines = []
+        for result in results:
+            lines.append(f"== {result['path']} ==")
+            lines.extend(_report_lines(result["slides"]))
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+    if failed:
+        raise SystemExit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Extract text from .ppt/.pptx")
-    parser.add_argument("path", help="Path to .ppt or .pptx")
+    parser.add_argument("path", nargs="?", help="Path to .ppt or .pptx")
     parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument("--batch", action="store_true", help="Read newline-separated paths from stdin")
     args = parser.parse_args()
 
-    path = args.path
-    if not os.path.exists(path):
-        raise SystemExit(f"File not found: {path}")
+    if args.batch:
+        if args.path is not None:
+            parser.error("path cannot be combined with --batch")
+        _run_batch(args.json)
+        return
+    if args.path is None:
+        parser.error("path is required unless --batch is given")
 
-    ext = os.path.splitext(path)[1].lower()
-    if ext == ".pptx":
-        slides = _extract_pptx(path)
-    elif ext == ".ppt":
-        slides = _extract_ppt(path)
-    else:
-        raise SystemExit("Only .ppt or .pptx is supported")
+    slides = _extract(args.path)
 
     if args.json:
-        print(json.dumps(slides, ensure_ascii=False, indent=2))
+        json.dump(slides, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
         return
 
-    for slide in slides:
-        if slide["slide"] is None:
-            print("PPT Text:")
-        else:
-            print(f"Slide {slide['slide']}:")
-        for t in slide["texts"]:
-            print("-", t)
-        print()
+    # 行を集めて1回で書き出す（行ごとの print による書き込みを避ける）
+    lines = _report_lines(slides)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":